@@ -0,0 +1,59 @@
+import threading
+import time
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from models import User, Notification
+from settings import MANAGER_CACHE_TTL
+import notification_broker
+import metrics
+
+LOW_STOCK_TITLE = "Low Stock Alert"
+
+_manager_ids = None
+_manager_ids_read_at = 0.0
+_manager_ids_lock = threading.Lock()
+
+def crossed_low_stock(quantity_after: int, minimum_level: int, quantity_used: int) -> bool:
+    # Edge trigger: only the decrement that takes the item from above to at-or-below
+    # its minimum fires, so an item re-arms as soon as a restock lifts it back above
+    return quantity_after <= minimum_level < quantity_after + quantity_used
+
+def became_low(was_quantity, was_minimum, quantity, minimum_level) -> bool:
+    # Same edge for manual edits, e.g. a lowered count or a raised minimum
+    return quantity <= minimum_level and not was_quantity <= was_minimum
+
+def manager_ids(db: Session) -> list:
+    global _manager_ids, _manager_ids_read_at
+    with _manager_ids_lock:
+        if _manager_ids is not None and time.monotonic() - _manager_ids_read_at < MANAGER_CACHE_TTL:
+            return _manager_ids
+    ids = [row.id for row in db.query(User.id).filter(User.role == "manager")]
+    with _manager_ids_lock:
+        _manager_ids, _manager_ids_read_at = ids, time.monotonic()
+    return ids
+
+def invalidate_manager_cache():
+    global _manager_ids
+    with _manager_ids_lock:
+        _manager_ids = None
+
+def fire_low_stock_alert(db: Session, message: str) -> int:
+    """Queue one low-stock notification per manager in the caller's transaction."""
+    rows = [
+        {"user_id": manager_id, "title": LOW_STOCK_TITLE, "message": message, "is_read": 0}
+        for manager_id in manager_ids(db)
+    ]
+    created = []
+    if rows:
+        created = db.execute(
+            insert(Notification).returning(
+                Notification.id, Notification.user_id, Notification.title,
+                Notification.message, Notification.is_read, Notification.created_at
+            ),
+            rows
+        )
+    # Counted on commit, so a rolled back consumption does not register an alert
+    notification_broker.publish_after_commit(
+        db, [dict(row._mapping) for row in created], on_commit=metrics.LOW_STOCK_ALERTS.inc
+    )
+    return len(rows)
@@ -1,22 +1,127 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from passlib.context import CryptContext
 from jose import jwt
 from datetime import datetime, timedelta
 from typing import Optional
+from settings import (
+    STATELESS_AUTH, BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT, STREAM_TOKEN_TTL_SECONDS
+)
 
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+# Claim that limits a token to opening the notification stream
+STREAM_TOKEN_SCOPE = "notification-stream"
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
-def hash_password(password: str) -> str:
+# bcrypt runs in its own processes; the semaphore caps how many request threads
+# can be parked waiting on it, so a login burst cannot take the whole threadpool
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_QUEUE_LIMIT)
+
+def _get_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+def _discard_hash_pool(pool):
+    # Only the broken pool is dropped; another thread may already have replaced it
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is pool:
+            _hash_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _take_hash_slot():
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Too many password operations in progress, try again shortly",
+            headers={"Retry-After": "1"}
+        )
+
+def _run_hashing(fn, *args):
+    if PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+    _take_hash_slot()
+    try:
+        pool = _get_hash_pool()
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A worker died (OOM kill, crash) and the executor refuses all further work;
+            # start a fresh pool and retry once
+            _discard_hash_pool(pool)
+            return _get_hash_pool().submit(fn, *args).result()
+    finally:
+        _hash_slots.release()
+
+async def _run_hashing_async(fn, *args):
+    # Same slots and retry as _run_hashing, but the event loop awaits the worker process
+    if PASSWORD_HASH_WORKERS <= 0:
+        return await run_in_threadpool(fn, *args)
+    _take_hash_slot()
+    try:
+        pool = _get_hash_pool()
+        try:
+            return await asyncio.wrap_future(pool.submit(fn, *args))
+        except BrokenProcessPool:
+            _discard_hash_pool(pool)
+            return await asyncio.wrap_future(_get_hash_pool().submit(fn, *args))
+    finally:
+        _hash_slots.release()
+
+def shutdown_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(cancel_futures=True)
+            _hash_pool = None
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+def hash_password(password: str) -> str:
+    return _run_hashing(_hash, password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _run_hashing(_verify, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing_async(_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing_async(_verify, plain_password, hashed_password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None, user=None):
     to_encode = data.copy()
+    if user is not None and STATELESS_AUTH:
+        # Enough identity for get_current_user to skip loading the user row
+        to_encode.update({
+            "email": user.email,
+            "name": user.name,
+            "role": user.role,
+            "ver": user.token_version or 0
+        })
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -26,6 +131,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_stream_token(user_id: int, token_version: int) -> str:
+    expire = datetime.utcnow() + timedelta(seconds=STREAM_TOKEN_TTL_SECONDS)
+    return jwt.encode(
+        {"sub": str(user_id), "scope": STREAM_TOKEN_SCOPE, "ver": token_version, "exp": expire},
+        SECRET_KEY, algorithm=ALGORITHM
+    )
+
 def decode_token(token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -0,0 +1,165 @@
+"""Bulk synthetic workshop data for load tests.
+
+Run from backend/:
+    python -m benchmark.datagen --database sqlite:///./bench.db --preset large
+    python -m benchmark.datagen --database sqlite:///./bench.db --users 5000 --jobs 1000000 --usages 10000000
+
+Rows are produced by recursive CTEs inside SQLite, in chunks, so millions
+of rows load without round trips through Python. Every value is a
+deterministic function of the row number: the same sizes and end date
+always give the same dataset. Appends to whatever is already there.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from sqlalchemy import text
+
+PRESETS = {
+    "small": {"users": 200, "jobs": 10_000, "usages": 100_000, "materials": 200, "spareparts": 200},
+    "medium": {"users": 1_000, "jobs": 100_000, "usages": 1_000_000, "materials": 1_000, "spareparts": 1_000},
+    "large": {"users": 5_000, "jobs": 1_000_000, "usages": 10_000_000, "materials": 2_000, "spareparts": 2_000},
+}
+BENCH_PASSWORD = "bench123"
+# Every MANAGER_EVERY-th bench user is a manager
+MANAGER_EVERY = 50
+# Items whose number is a multiple of this start close to their minimum level
+LOW_STOCK_EVERY = 20
+CHUNK_ROWS = 250_000
+HISTORY_MINUTES = 365 * 24 * 60
+
+def bench_email(number: int) -> str:
+    return f"bench{number}@example.com"
+
+def is_manager(number: int) -> bool:
+    return number % MANAGER_EVERY == 0
+
+def _series(conn, count: int, sql: str, **params):
+    # n(i) runs from 1 to count; each chunk is its own statement and transaction
+    for start in range(1, count + 1, CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS - 1, count)
+        conn.execute(text(
+            "WITH RECURSIVE n(i) AS (SELECT :start UNION ALL SELECT i + 1 FROM n WHERE i < :stop) " + sql
+        ), {"start": start, "stop": stop, **params})
+        conn.commit()
+
+def _offset_timestamp(minutes_sql: str) -> str:
+    # Written the way SQLAlchemy's SQLite DateTime stores values ('... HH:MM:SS.ffffff');
+    # keyset cursors compare the text, so a bare datetime() result would sort wrongly
+    return f"datetime(:end, '-' || ({minutes_sql}) || ' minutes') || :fraction"
+
+def _next_id(conn, table: str) -> int:
+    return conn.execute(text(f"SELECT coalesce(max(id), 0) + 1 FROM {table}")).scalar()
+
+def generate(engine, users: int, jobs: int, usages: int, materials: int, spareparts: int,
+             end: datetime, log=print) -> dict:
+    """Append a synthetic dataset and rebuild the usage rollups.
+
+    Returns the id ranges that were written, keyed by table.
+    """
+    from auth import hash_password
+    from database import SessionLocal
+    import rollups
+
+    password = hash_password(BENCH_PASSWORD)
+    end_text = end.strftime("%Y-%m-%d %H:%M:%S.%f")
+    # Offsets are whole minutes, so every generated timestamp shares end's fraction
+    fraction = end.strftime(".%f")
+
+    with engine.connect() as conn:
+        first_user = _next_id(conn, "users")
+        first_material = _next_id(conn, "materials")
+        first_part = _next_id(conn, "spareparts")
+        first_job = _next_id(conn, "jobs")
+        ranges = {
+            "users": (first_user, first_user + users - 1),
+            "materials": (first_material, first_material + materials - 1),
+            "spareparts": (first_part, first_part + spareparts - 1),
+            "jobs": (first_job, first_job + jobs - 1),
+        }
+        # Numbering continues from existing bench users so repeated runs never clash
+        bench_offset = conn.execute(text("SELECT count(*) FROM users WHERE email LIKE 'bench%@example.com'")).scalar()
+
+        started = time.perf_counter()
+        _series(conn, users,
+            "INSERT INTO users (email, password, name, role, token_version) "
+            "SELECT 'bench' || (i + :offset) || '@example.com', :password, 'Bench User ' || (i + :offset), "
+            "CASE WHEN (i + :offset) % :every = 0 THEN 'manager' ELSE 'employee' END, 0 FROM n",
+            offset=bench_offset, password=password, every=MANAGER_EVERY)
+        log(f"{'users':16} {users:>10,}  {time.perf_counter() - started:6.1f}s")
+
+        for table, name_column, label, count in (
+            ("materials", "material_name, unit", "'Bench material ' || i, 'pcs'", materials),
+            ("spareparts", "part_name", "'Bench part ' || i", spareparts),
+        ):
+            started = time.perf_counter()
+            _series(conn, count,
+                f"INSERT INTO {table} ({name_column}, quantity, minimum_level, updated_at) "
+                f"SELECT {label}, "
+                "CASE WHEN i % :low = 0 THEN 60 + i % 10 ELSE 1000000 + (i * 7919) % 5000 END, "
+                "50 + i % 10, :end FROM n",
+                low=LOW_STOCK_EVERY, end=end_text)
+            log(f"{table:16} {count:>10,}  {time.perf_counter() - started:6.1f}s")
+
+        started = time.perf_counter()
+        _series(conn, jobs,
+            "INSERT INTO jobs (job_title, assigned_to, status, progress, created_at, updated_at) "
+            "SELECT 'Bench job ' || i, "
+            "CASE WHEN i % 10 = 0 THEN NULL ELSE :first_user + (i * 7919) % :users END, "
+            "CASE i % 4 WHEN 0 THEN 'completed' WHEN 1 THEN 'in progress' ELSE 'pending' END, "
+            "CASE i % 4 WHEN 0 THEN 100 WHEN 1 THEN (i * 13) % 100 ELSE 0 END, "
+            f"{_offset_timestamp('(i * 104729) % :history')}, "
+            f"{_offset_timestamp('(i * 104729) % :history / 2')} FROM n",
+            first_user=first_user, users=max(users, 1), end=end_text, fraction=fraction, history=HISTORY_MINUTES)
+        log(f"{'jobs':16} {jobs:>10,}  {time.perf_counter() - started:6.1f}s")
+
+        # Usage rows are split evenly between the two ledgers
+        for table, item_column, first_item, items, count in (
+            ("material_usages", "material_id", first_material, materials, usages // 2),
+            ("sparepart_usages", "spare_part_id", first_part, spareparts, usages - usages // 2),
+        ):
+            started = time.perf_counter()
+            _series(conn, count,
+                f"INSERT INTO {table} ({item_column}, quantity_used, used_by, used_date, job_id) "
+                "SELECT :first_item + (i * 7919) % :items, 1 + i % 5, :first_user + (i * 104729) % :users, "
+                f"{_offset_timestamp('(i * 15485863) % :history')}, "
+                "CASE WHEN :jobs = 0 THEN NULL ELSE :first_job + (i * 31) % :jobs END FROM n",
+                first_item=first_item, items=max(items, 1), first_user=first_user, users=max(users, 1),
+                first_job=first_job, jobs=jobs, end=end_text, fraction=fraction, history=HISTORY_MINUTES)
+            log(f"{table:16} {count:>10,}  {time.perf_counter() - started:6.1f}s")
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        rollups.rebuild(db)
+    finally:
+        db.close()
+    log(f"{'rollups rebuilt':27} {time.perf_counter() - started:6.1f}s")
+    return ranges
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", required=True, help="SQLAlchemy URL, e.g. sqlite:///./bench.db")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    for size in PRESETS["small"]:
+        parser.add_argument(f"--{size}", type=int, help=f"Override the preset's {size} count")
+    parser.add_argument("--end-date", type=datetime.fromisoformat,
+                        default=datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
+                        help="Newest timestamp in the data (default: today at midnight)")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so the target database is chosen before the app modules load
+    os.environ["DATABASE_URL"] = args.database
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from database import engine
+    import migrate
+
+    migrate.ensure_schema()
+    sizes = {size: getattr(args, size) or count for size, count in PRESETS[args.preset].items()}
+    generate(engine, end=args.end_date, **sizes)
+    from auth import shutdown_hash_pool
+    shutdown_hash_pool()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Bytes on the wire and latency of the big list endpoints per encoding.
+
+Run from backend/: python -m benchmark.responses [--jobs N] [--usages N]
+
+Uses a throwaway SQLite database and the ASGI app in-process, so the
+numbers cover routing, serialization and compression but not the network.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ENCODINGS = ("identity", "gzip", "br")
+ENDPOINTS = (
+    "/api/jobs/?limit=500",
+    "/api/spareparts/usages?limit=500",
+    "/api/materials/",
+    "/api/reports/employee-performance",
+)
+
+def measure(client, headers: dict, path: str, encoding: str, runs: int) -> dict:
+    timings, size = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = client.get(path, headers={**headers, "Accept-Encoding": encoding})
+        timings.append((time.perf_counter() - start) * 1000)
+        size = response.num_bytes_downloaded
+        assert response.status_code == 200, (path, response.status_code)
+    return {
+        "bytes": size,
+        "encoding": response.headers.get("content-encoding", "identity"),
+        "median_ms": round(statistics.median(timings), 2),
+    }
+
+def serialization(rows: list, runs: int) -> dict:
+    # The report routes used to go through jsonable_encoder and json.dumps
+    from fastapi.encoders import jsonable_encoder
+    from responses import ORJSONResponse
+
+    def best(render):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - start) * 1000)
+        return round(min(timings), 3)
+
+    return {
+        "jsonable_encoder_ms": best(lambda: json.dumps(jsonable_encoder(rows)).encode()),
+        "orjson_ms": best(lambda: ORJSONResponse(rows)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--usages", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    os.chdir(workdir)
+    # Settings are read at import time; pin the throwaway database so a DATABASE_URL
+    # from the environment never receives the synthetic rows
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'responses.db')}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.setdefault("NOTIFICATION_RETENTION_ENABLED", "0")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from fastapi.testclient import TestClient
+    from database import engine
+    import main as app_module
+    from benchmark import datagen
+
+    results = {"endpoints": {}}
+    with TestClient(app_module.app) as client:
+        datagen.generate(
+            engine, users=50, jobs=args.jobs, usages=args.usages, materials=50, spareparts=50,
+            end=datetime.now(), log=lambda line: None
+        )
+        token = client.post(
+            "/api/login", json={"email": "manager@example.com", "password": "manager123"}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for path in ENDPOINTS:
+            results["endpoints"][path] = {
+                encoding: measure(client, headers, path, encoding, args.runs) for encoding in ENCODINGS
+            }
+        rows = client.get(ENDPOINTS[0], headers=headers).json()
+        results["serialization_500_jobs"] = serialization(rows, args.runs)
+
+    for path, by_encoding in results["endpoints"].items():
+        print(path)
+        for encoding, result in by_encoding.items():
+            print(f"  {encoding:9} {result['bytes']:>9} B  {result['median_ms']:>8} ms  ({result['encoding']})")
+    print("serialization of 500 jobs:", results["serialization_500_jobs"])
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
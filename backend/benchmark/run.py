@@ -0,0 +1,240 @@
+"""Load scenarios against the API and report per-endpoint latency, throughput and queries.
+
+Run from backend/ after loading a dataset with benchmark.datagen.
+
+In-process against the ASGI app:
+    python -m benchmark.run --database sqlite:///./bench.db --scenario dashboard reports --concurrency 8 --duration 15
+Against a uvicorn started on the same database:
+    python -m benchmark.run --url http://127.0.0.1:8000 --concurrency 8 --duration 15
+
+Queries per request come from the db entry of the Server-Timing header,
+so they are reported for either target unless QUERY_STATS_ENABLED is off.
+
+--output writes the results as JSON; --baseline compares against an
+earlier file and exits with status 1 when an endpoint's p95 grows by
+more than --tolerance or it starts issuing more queries.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+
+from benchmark.datagen import BENCH_PASSWORD, MANAGER_EVERY, bench_email, is_manager
+from benchmark.scenarios import SCENARIOS, ROLES
+
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) quer')
+
+def queries_from(response: httpx.Response):
+    match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+    return int(match.group(1)) if match else None
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, token: str, rng: random.Random, catalog: dict, samples: dict):
+        self.client = client
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.rng = rng
+        self.catalog = catalog
+        self.samples = samples
+
+    async def request(self, name: str, method: str, path: str, ok=(200, 304), headers=None, **kwargs):
+        started = time.perf_counter()
+        response = await self.client.request(method, path, headers={**self.headers, **(headers or {})}, **kwargs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.samples[name].append((elapsed_ms, response.status_code in ok, queries_from(response)))
+        return response
+
+    async def get(self, name: str, path: str, **kwargs):
+        return await self.request(name, "GET", path, **kwargs)
+
+    async def post(self, name: str, path: str, **kwargs):
+        return await self.request(name, "POST", path, **kwargs)
+
+def percentile(ordered: list, fraction: float) -> float:
+    # Nearest rank on an already sorted list
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+def summarize(samples: dict, elapsed: float) -> dict:
+    endpoints = {}
+    for name, rows in sorted(samples.items()):
+        latencies = sorted(row[0] for row in rows)
+        queries = [row[2] for row in rows if row[2] is not None]
+        endpoints[name] = {
+            "count": len(rows),
+            "errors": sum(1 for row in rows if not row[1]),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "rps": round(len(rows) / elapsed, 1),
+            "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        }
+    return endpoints
+
+async def login_accounts(client: httpx.AsyncClient, role: str, count: int) -> list:
+    # Bench accounts are numbered; managers are the multiples of MANAGER_EVERY
+    numbers = (
+        (MANAGER_EVERY * k for k in itertools.count(1)) if role == "manager"
+        else (n for n in itertools.count(1) if not is_manager(n))
+    )
+    tokens = []
+    for number in numbers:
+        if len(tokens) == count:
+            break
+        response = await client.post("/api/login", json={"email": bench_email(number), "password": BENCH_PASSWORD})
+        if response.status_code != 200:
+            break
+        tokens.append(response.json()["access_token"])
+    if not tokens:
+        sys.exit(f"No bench {role} accounts found; load a dataset with python -m benchmark.datagen first")
+    # Fewer accounts than virtual users are shared round-robin
+    return [tokens[i % len(tokens)] for i in range(count)]
+
+async def load_catalog(client: httpx.AsyncClient, token: str) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    materials = (await client.get("/api/materials/", headers=headers)).json()
+    spareparts = (await client.get("/api/spareparts/", headers=headers)).json()
+    jobs = (await client.get("/api/jobs/", params={"limit": 500}, headers=headers)).json()
+    return {
+        "materials": [m["id"] for m in materials],
+        "spareparts": [p["id"] for p in spareparts],
+        "jobs": [j["id"] for j in jobs],
+    }
+
+async def run_scenario(client, name: str, concurrency: int, duration: float, catalog: dict, seed: int) -> dict:
+    scenario = SCENARIOS[name]
+    tokens = await login_accounts(client, ROLES[name], concurrency)
+    samples = defaultdict(list)
+    users = [
+        VirtualUser(client, token, random.Random(f"{seed}:{name}:{i}"), catalog, samples)
+        for i, token in enumerate(tokens)
+    ]
+    iterations = 0
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def loop(vu):
+        nonlocal iterations
+        while time.perf_counter() < deadline:
+            await scenario(vu)
+            iterations += 1
+
+    await asyncio.gather(*(loop(vu) for vu in users))
+    elapsed = time.perf_counter() - started
+    return {
+        "iterations": iterations,
+        "elapsed_s": round(elapsed, 2),
+        "iterations_per_s": round(iterations / elapsed, 2),
+        "endpoints": summarize(samples, elapsed),
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for scenario, result in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scenario, {}).get("endpoints", {})
+        for name, stats in result["endpoints"].items():
+            old = before.get(name)
+            if not old:
+                continue
+            stats["baseline_p95_ms"] = old["p95_ms"]
+            if old["p95_ms"] and stats["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{scenario}/{name}: p95 {old['p95_ms']} -> {stats['p95_ms']} ms")
+            # Half a query of slack absorbs cache misses such as token version refreshes
+            if (old["queries_per_request"] is not None and stats["queries_per_request"] is not None
+                    and stats["queries_per_request"] > old["queries_per_request"] + 0.5):
+                regressions.append(
+                    f"{scenario}/{name}: queries {old['queries_per_request']} -> {stats['queries_per_request']}"
+                )
+    return regressions
+
+def print_report(results: dict):
+    print(f"{'endpoint':42} {'count':>7} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>7} {'q/req':>6} {'base p95':>9}")
+    for scenario, result in results["scenarios"].items():
+        print(f"{scenario}  ({result['iterations']} iterations, {result['iterations_per_s']}/s)")
+        for name, s in result["endpoints"].items():
+            queries = "-" if s["queries_per_request"] is None else s["queries_per_request"]
+            base = s.get("baseline_p95_ms", "")
+            print(f"  {name:40} {s['count']:>7} {s['errors']:>5} {s['p50_ms']:>8} {s['p95_ms']:>8} "
+                  f"{s['p99_ms']:>8} {s['rps']:>7} {queries:>6} {base:>9}")
+
+async def run(args) -> dict:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        import main
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench", timeout=60)
+
+    async with client:
+        manager_token = (await login_accounts(client, "manager", 1))[0]
+        catalog = await load_catalog(client, manager_token)
+        results = {
+            "meta": {
+                "target": args.url or f"in-process ({os.environ.get('API_STACK', 'sync')} stack)",
+                "concurrency": args.concurrency,
+                "duration_s": args.duration,
+                "seed": args.seed,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+            },
+            "scenarios": {},
+        }
+        for name in args.scenario:
+            results["scenarios"][name] = await run_scenario(
+                client, name, args.concurrency, args.duration, catalog, args.seed
+            )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--database", help="Run the app in-process on this SQLAlchemy URL")
+    target.add_argument("--url", help="Base URL of a running server")
+    parser.add_argument("--stack", choices=["sync", "async"], help="API_STACK for the in-process app")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per scenario")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a results file from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 growth before flagging (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.database:
+        # Settings are read at import time, so the environment is set before the app loads
+        os.environ["DATABASE_URL"] = args.database
+        os.environ["NOTIFICATION_RETENTION_ENABLED"] = "0"
+        if args.stack:
+            os.environ["API_STACK"] = args.stack
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    results = asyncio.run(run(args))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+    print_report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.database:
+        from auth import shutdown_hash_pool
+        shutdown_hash_pool()
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print("  " + line)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
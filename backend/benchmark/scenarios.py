@@ -0,0 +1,65 @@
+"""Scripted user journeys for the load runner.
+
+Each scenario is an async function taking a VirtualUser (see run.py). One
+call is one iteration of the journey and every request inside it is
+recorded under the name passed to vu.get/vu.post. ROLES says which kind
+of bench account runs it.
+"""
+
+async def dashboard_open(vu):
+    # What the layout and dashboard fetch when a page is opened
+    await vu.get("me", "/api/me")
+    await vu.get("dashboard-stats", "/api/reports/dashboard-stats")
+    await vu.get("notifications.unread-count", "/api/notifications/unread-count")
+    await vu.get("notifications.page", "/api/notifications/", params={"limit": 20})
+
+async def job_board(vu):
+    response = await vu.get("jobs.page", "/api/jobs/", params={"limit": 100})
+    cursor = response.headers.get("x-next-cursor")
+    if cursor:
+        await vu.get("jobs.next-page", "/api/jobs/", params={"limit": 100, "cursor": cursor})
+    await vu.get("jobs.employees", "/api/jobs/employees")
+    # A repeat view revalidates the first page instead of downloading it again
+    etag = response.headers.get("etag")
+    if etag:
+        await vu.get("jobs.page-revalidate", "/api/jobs/", params={"limit": 100}, headers={"If-None-Match": etag})
+
+async def catalog_browse(vu):
+    await vu.get("materials.list", "/api/materials/")
+    await vu.get("spareparts.list", "/api/spareparts/")
+    await vu.get("spareparts.usages", "/api/spareparts/usages", params={"limit": 100})
+
+async def consumption_burst(vu):
+    # Employees booking stock against jobs; a few items sit near their minimum so alerts fire
+    job_id = vu.rng.choice(vu.catalog["jobs"])
+    lines = [
+        {"kind": "material", "item_id": vu.rng.choice(vu.catalog["materials"]), "quantity": vu.rng.randint(1, 3)},
+        {"kind": "sparepart", "item_id": vu.rng.choice(vu.catalog["spareparts"]), "quantity": 1},
+    ]
+    await vu.post("jobs.consume", f"/api/jobs/{job_id}/consume", json={"lines": lines}, ok=(200, 400, 409))
+    part_id = vu.rng.choice(vu.catalog["spareparts"])
+    await vu.post(
+        "spareparts.use", f"/api/spareparts/{part_id}/use",
+        json={"spare_part_id": part_id, "quantity_used": 1}, ok=(200, 400)
+    )
+
+async def report_run(vu):
+    await vu.get("reports.employee-performance", "/api/reports/employee-performance")
+    await vu.get("reports.usage-trends", "/api/reports/usage-trends", params={"granularity": "week"})
+    await vu.get("spareparts.summary", "/api/spareparts/summary/monthly")
+
+SCENARIOS = {
+    "dashboard": dashboard_open,
+    "job-board": job_board,
+    "catalog": catalog_browse,
+    "consumption": consumption_burst,
+    "reports": report_run,
+}
+
+ROLES = {
+    "dashboard": "manager",
+    "job-board": "manager",
+    "catalog": "employee",
+    "consumption": "employee",
+    "reports": "manager",
+}
@@ -0,0 +1,138 @@
+import csv
+import io
+import tempfile
+from datetime import datetime
+from itertools import islice
+from typing import Iterable
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update
+from sqlalchemy.orm import Session
+from models import Material, SparePart
+from schemas import MaterialCreate, SparePartCreate
+from settings import IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS
+import rollups
+import alerts
+
+# The name lookup binds one parameter per row, and SQLite builds before 3.32
+# allow only 999 per statement, so larger settings are capped
+MAX_CHUNK_ROWS = 900
+CHUNK_ROWS = min(IMPORT_CHUNK_SIZE, MAX_CHUNK_ROWS)
+
+# kind -> (model, name column, schema, label used in alerts)
+CATALOGS = {
+    rollups.MATERIAL: (Material, "material_name", MaterialCreate, "materials"),
+    rollups.SPARE_PART: (SparePart, "part_name", SparePartCreate, "spare parts"),
+}
+
+def _format_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+def _upsert_chunk(db: Session, kind: str, rows: list, result: dict):
+    """Validate and write one chunk of (line number, raw row) pairs.
+
+    Rows are matched to the catalog by name. Columns left out of the file
+    keep their current values on existing items and take the schema
+    defaults on new ones; a name repeated within a chunk keeps its last row.
+    """
+    model, name_field, schema, _ = CATALOGS[kind]
+    name_column = getattr(model, name_field)
+    fields = list(schema.model_fields)
+
+    names = {row.get(name_field) for _, row in rows if row.get(name_field)}
+    existing = {}
+    if names:
+        # Only the first item with a given name is updated when the catalog already has duplicates
+        for item in db.execute(
+            select(model.id, *(getattr(model, f) for f in fields))
+            .filter(name_column.in_(names))
+            .order_by(model.id.desc())
+        ):
+            existing[getattr(item, name_field)] = item
+
+    inserts, updates = {}, {}
+    for line, row in rows:
+        current = existing.get(row.get(name_field))
+        values = {f: getattr(current, f) for f in fields} if current else {}
+        values.update(row)
+        try:
+            item = schema(**values).model_dump()
+        except ValidationError as e:
+            result["failed"] += 1
+            if len(result["errors"]) < IMPORT_MAX_ERRORS:
+                result["errors"].append({"row": line, "error": _format_error(e)})
+            continue
+        if current:
+            item["id"] = current.id
+            updates[current.id] = (item, current)
+        else:
+            inserts[item[name_field]] = item
+
+    now = datetime.now()
+    if inserts:
+        db.execute(insert(model), [{**item, "updated_at": now} for item in inserts.values()])
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany over the chunk
+        db.execute(update(model), [{**item, "updated_at": now} for item, _ in updates.values()])
+    db.commit()
+
+    result["created"] += len(inserts)
+    result["updated"] += len(updates)
+    # Items that landed low either arrived below their minimum or were pushed there by the file
+    result["low_stock"] += sum(1 for item in inserts.values() if item["quantity"] <= item["minimum_level"])
+    result["low_stock"] += sum(
+        1 for item, current in updates.values()
+        if alerts.became_low(current.quantity, current.minimum_level, item["quantity"], item["minimum_level"])
+    )
+
+def import_catalog(db: Session, kind: str, lines: Iterable[str]) -> dict:
+    """Upsert catalog items from CSV text, one transaction per chunk.
+
+    The header names the schema fields; unknown columns are ignored and
+    empty cells count as missing. Invalid rows are skipped and reported
+    with their line number; a header without the name column raises
+    ValueError before anything is written.
+    """
+    _, name_field, schema, label = CATALOGS[kind]
+    reader = csv.DictReader(lines)
+    fields = set(schema.model_fields)
+    if not reader.fieldnames or name_field not in reader.fieldnames:
+        raise ValueError(f"The CSV header must include {name_field}")
+
+    result = {"created": 0, "updated": 0, "failed": 0, "low_stock": 0, "errors": []}
+
+    def parsed_rows():
+        for row in reader:
+            values = {k: v.strip() for k, v in row.items() if k in fields and v and v.strip()}
+            yield reader.line_num, values
+
+    rows = parsed_rows()
+    while chunk := list(islice(rows, CHUNK_ROWS)):
+        _upsert_chunk(db, kind, chunk, result)
+
+    if result["low_stock"]:
+        alerts.fire_low_stock_alert(
+            db, f"Catalog import left {result['low_stock']} {label} at or below their minimum level."
+        )
+        db.commit()
+    return result
+
+async def import_upload(request: Request, db: Session, current_user, kind: str) -> dict:
+    if current_user.role != "manager":
+        raise HTTPException(status_code=403, detail=f"Only managers can import {CATALOGS[kind][3]}")
+
+    # The body is spooled to disk so a large file never sits in memory whole
+    with tempfile.TemporaryFile() as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+        lines = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+        try:
+            return await run_in_threadpool(import_catalog, db, kind, lines)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="The file must be UTF-8 encoded CSV")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,82 @@
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+# Already-compressed downloads gain nothing from a second pass
+EXCLUDED_CONTENT_TYPES = DEFAULT_EXCLUDED_CONTENT_TYPES + (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+)
+# Chunks at least this big are compressed off the event loop
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+def accepted_encodings(header: str) -> set:
+    encodings = set()
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int):
+        super().__init__(app, minimum_size, exclude_content_types=EXCLUDED_CONTENT_TYPES)
+        self.quality = quality
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(self._compress_body, body, more_body)
+        return self._compress_body(body, more_body)
+
+    def _compress_body(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        # Streams are flushed per chunk so a client can decode as bytes arrive
+        compressed = self._compressor.process(body)
+        return compressed + (self._compressor.flush() if more_body else self._compressor.finish())
+
+class CompressionMiddleware:
+    """Brotli when the client takes it and the module is installed, else gzip.
+
+    Bodies under minimum_size, event streams and already-compressed
+    downloads pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int, gzip_level: int, brotli_quality: int):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encodings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in encodings:
+            responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality)
+        elif "gzip" in encodings:
+            responder = GZipResponder(
+                self.app,
+                self.minimum_size,
+                compresslevel=self.gzip_level,
+                thread_minimum_size=THREAD_MINIMUM_SIZE,
+                exclude_content_types=EXCLUDED_CONTENT_TYPES
+            )
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size, exclude_content_types=EXCLUDED_CONTENT_TYPES)
+        await responder(scope, receive, send)
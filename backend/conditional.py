@@ -0,0 +1,56 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+from fastapi import Request, Response
+from sqlalchemy import select, func
+from models import Job, ChangeCounter
+
+# Authenticated data: browsers may keep a copy but must revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+def catalog_version_statement(model):
+    # Edits and consumption bump updated_at; the count catches deletes
+    return select(func.max(model.updated_at), func.count(model.id))
+
+def job_version_statement():
+    # Job rows carry the assignee's name; the users counter moves on every insert, delete and rename
+    return select(
+        func.max(Job.updated_at),
+        func.count(Job.id),
+        select(ChangeCounter.value).where(ChangeCounter.name == "users").scalar_subquery()
+    )
+
+def make_etag(version, *variant) -> str:
+    # Weak because the same rows may go out with a different encoding
+    digest = hashlib.blake2b(repr((tuple(version), variant)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so the W/ prefix is ignored on both sides
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+def check_not_modified(request: Request, response: Response, version, *variant) -> Optional[Response]:
+    """Set the validators for a collection and short-circuit a matching revalidation.
+
+    version is the row from one of the *_version_statement helpers; variant
+    holds whatever else shapes the body, such as the page parameters.
+    Returns a 304 response when the client's copy is current, else None
+    after putting ETag/Last-Modified on the response about to be built.
+    """
+    etag = make_etag(version, *variant)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    last_modified: Optional[datetime] = version[0]
+    if last_modified is not None:
+        # Stored as naive local time
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -1,14 +1,67 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from settings import (
+    DATABASE_URL, ASYNC_DATABASE_URL, API_STACK, DB_PROFILE, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    SQLITE_BUSY_TIMEOUT_MS, SQLITE_SYNCHRONOUS, SQLITE_CACHE_SIZE_KB, SQLITE_MMAP_SIZE, SLOW_QUERY_MS
+)
+import slow_queries
 
-DATABASE_URL = "sqlite:///./app.db"
+is_sqlite = DATABASE_URL.startswith("sqlite")
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def _engine_options():
+    options = {}
+    if is_sqlite:
+        # The sqlite3 timeout installs a busy handler that retries while another writer holds the lock
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000
+        }
+    if DB_PROFILE == "production":
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT
+        )
+    return options
+
+engine = create_engine(DATABASE_URL, **_engine_options())
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    # Only takes effect on a brand new file, and must precede the switch to WAL;
+    # it lets the retention job hand freed pages back incrementally
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    # WAL lets readers run alongside the single writer
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+if is_sqlite and DB_PROFILE == "production":
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
 
-print("DB URL:", engine.url)
+if SLOW_QUERY_MS > 0:
+    slow_queries.instrument(engine)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+# The async stack only exists when selected, so aiosqlite stays optional for sync deployments
+async_engine = None
+AsyncSessionLocal = None
+
+if API_STACK == "async":
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options())
+    if is_sqlite and DB_PROFILE == "production":
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    if SLOW_QUERY_MS > 0:
+        slow_queries.instrument(async_engine.sync_engine)
+
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
@@ -1,12 +1,27 @@
+import threading
+import time
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import SessionLocal, AsyncSessionLocal
 from models import User
-from auth import SECRET_KEY, ALGORITHM
+from schemas import UserResponse
+from auth import SECRET_KEY, ALGORITHM, STREAM_TOKEN_SCOPE, create_stream_token
+from settings import STATELESS_AUTH, TOKEN_VERSION_CACHE_TTL
+
+# Roles allowed to manage users and use the diagnostics endpoints
+PRIVILEGED_ROLES = ("manager", "admin")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
+# For endpoints that also accept the token elsewhere, e.g. EventSource streams via ?token=
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login", auto_error=False)
+
+# user_id -> (token_version or None if the user is gone, time it was read)
+_token_versions = {}
+_token_versions_lock = threading.Lock()
 
 def get_db():
     db = SessionLocal()
@@ -15,26 +30,113 @@ def get_db():
     finally:
         db.close()
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def run_sync_handler(db, handler, **kwargs):
+    """Run a sync route's body against an async session.
+
+    The handler gets the session's sync facade as db. Its statements still
+    go through the async driver, so it runs on the event loop between awaits
+    instead of holding a threadpool worker for the whole request.
+    """
+    return await db.run_sync(lambda session: handler(db=session, **kwargs))
+
+def _cached_token_version(user_id: int):
+    # Returns (hit, version); a hit may carry None for a deleted user
+    with _token_versions_lock:
+        cached = _token_versions.get(user_id)
+    if cached and time.monotonic() - cached[1] < TOKEN_VERSION_CACHE_TTL:
+        return True, cached[0]
+    return False, None
+
+def refresh_token_version(user_id: int, version=None):
+    # Called after a user is edited or deleted; None rejects every token for that user
+    with _token_versions_lock:
+        _token_versions[user_id] = (version, time.monotonic())
+    return version
+
+def _current_token_version(db: Session, user_id: int):
+    hit, version = _cached_token_version(user_id)
+    if hit:
+        return version
+    row = db.query(User.token_version).filter(User.id == user_id).first()
+    return refresh_token_version(user_id, (row.token_version or 0) if row else None)
+
+async def _current_token_version_async(db, user_id: int):
+    hit, version = _cached_token_version(user_id)
+    if hit:
+        return version
+    row = (await db.execute(select(User.token_version).filter(User.id == user_id))).first()
+    return refresh_token_version(user_id, (row.token_version or 0) if row else None)
+
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _decode_token(token: str, scope: Optional[str] = None):
+    # Scoped tokens, such as stream tokens, are only accepted where that scope is asked for
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
+        if user_id is None or payload.get("scope") != scope:
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    return payload, int(user_id)
+
+def _user_from_claims(payload: dict, user_id: int, version):
+    if version is None or version != payload["ver"]:
+        raise _credentials_exception()
+    return UserResponse(
+        id=user_id,
+        email=payload["email"],
+        name=payload["name"],
+        role=payload["role"]
+    )
+
+# Plain def so the blocking Session work runs in the threadpool, not on the event loop
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    payload, user_id = _decode_token(token)
+    
+    # Tokens issued before the fast path carry no version and fall back to the lookup
+    if STATELESS_AUTH and "ver" in payload:
+        return _user_from_claims(payload, user_id, _current_token_version(db, user_id))
+    
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        raise _credentials_exception()
+    
+    return user
+
+def issue_stream_token(db: Session, user_id: int) -> str:
+    return create_stream_token(user_id, _current_token_version(db, user_id))
+
+def stream_token_user_id(token: str, db: Session) -> int:
+    payload, user_id = _decode_token(token, scope=STREAM_TOKEN_SCOPE)
+    # Revoked along with the user's other tokens when their token version moves
+    if _current_token_version(db, user_id) != payload.get("ver"):
+        raise _credentials_exception()
+    return user_id
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db = Depends(get_async_db)
+):
+    payload, user_id = _decode_token(token)
+    
+    if STATELESS_AUTH and "ver" in payload:
+        return _user_from_claims(payload, user_id, await _current_token_version_async(db, user_id))
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = (await db.execute(select(User).filter(User.id == user_id))).scalar_one_or_none()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
-    return user
\ No newline at end of file
+    return user
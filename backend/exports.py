@@ -0,0 +1,144 @@
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from database import SessionLocal
+from models import Material, SparePart, MaterialUsage, SparePartUsage, User
+from settings import EXPORT_BATCH_SIZE
+import rollups
+
+FORMATS = ("csv", "xlsx")
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+# Bytes of CSV gathered before a chunk is handed to the client
+CHUNK_SIZE = 64 * 1024
+
+USAGE_LEDGERS = {
+    rollups.MATERIAL: (MaterialUsage, MaterialUsage.material_id, Material, Material.material_name),
+    rollups.SPARE_PART: (SparePartUsage, SparePartUsage.spare_part_id, SparePart, SparePart.part_name),
+}
+
+def usage_export_statement(
+    item_kind: str,
+    item_id: Optional[int],
+    used_by: Optional[int],
+    job_id: Optional[int],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime]
+):
+    usage, item_column, item_model, name_column = USAGE_LEDGERS[item_kind]
+    # Plain columns rather than entities, so rows are never added to an identity map
+    stmt = select(
+        usage.id,
+        usage.used_date,
+        item_column,
+        name_column,
+        usage.quantity_used,
+        usage.used_by,
+        User.name,
+        usage.job_id
+    ).outerjoin(item_model, item_column == item_model.id).outerjoin(User, usage.used_by == User.id)
+
+    if item_id is not None:
+        stmt = stmt.filter(item_column == item_id)
+    if used_by is not None:
+        stmt = stmt.filter(usage.used_by == used_by)
+    if job_id is not None:
+        stmt = stmt.filter(usage.job_id == job_id)
+    if date_from is not None:
+        stmt = stmt.filter(usage.used_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.filter(usage.used_date < date_to)
+    return stmt.order_by(usage.used_date, usage.id)
+
+USAGE_EXPORT_HEADER = {
+    rollups.MATERIAL: ["id", "used_date", "material_id", "material_name", "quantity_used", "used_by", "used_by_name", "job_id"],
+    rollups.SPARE_PART: ["id", "used_date", "spare_part_id", "part_name", "quantity_used", "used_by", "used_by_name", "job_id"],
+}
+
+def inventory_export_statement(item_kind: str, low_only: bool):
+    if item_kind == rollups.MATERIAL:
+        stmt = select(
+            Material.id, Material.material_name, Material.quantity,
+            Material.minimum_level, Material.unit, Material.updated_at
+        )
+        model = Material
+    else:
+        stmt = select(
+            SparePart.id, SparePart.part_name, SparePart.quantity,
+            SparePart.minimum_level, SparePart.updated_at
+        )
+        model = SparePart
+    if low_only:
+        stmt = stmt.filter(model.quantity <= model.minimum_level)
+    return stmt.order_by(model.id)
+
+INVENTORY_EXPORT_HEADER = {
+    rollups.MATERIAL: ["id", "material_name", "quantity", "minimum_level", "unit", "updated_at"],
+    rollups.SPARE_PART: ["id", "part_name", "quantity", "minimum_level", "updated_at"],
+}
+
+def _rows(statement):
+    # The generator owns its session: the request's session is closed before streaming ends
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for row in result:
+            yield row
+    finally:
+        db.close()
+
+def _csv_chunks(statement, header: list):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    # The header goes out on its own so the download starts before the first batch is read
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for row in _rows(statement):
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _xlsx_chunks(statement, header: list, sheet_title: str):
+    from openpyxl import Workbook
+
+    # An xlsx file is a zip archive, so it is written out to disk first and then
+    # streamed; write-only mode keeps memory flat while the sheet is built
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append(header)
+    for row in _rows(statement):
+        sheet.append(list(row))
+
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+def export_response(statement, header: list, name: str, export_format: str) -> StreamingResponse:
+    if export_format == "xlsx":
+        body = _xlsx_chunks(statement, header, name)
+    else:
+        body = _csv_chunks(statement, header)
+    filename = f"{name}-{datetime.now():%Y%m%d}.{export_format}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
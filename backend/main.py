@@ -1,29 +1,78 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from database import Base, engine, SessionLocal
+from database import engine, async_engine, SessionLocal
 from models import User, Job, Material, SparePart, SparePartUsage
-from auth import hash_password
-from routes import users, jobs, materials, spareparts, notifications, reports
+from auth import hash_password, shutdown_hash_pool
+from pagination import NEXT_CURSOR_HEADER
+from settings import (
+    API_STACK, NOTIFICATION_RETENTION_ENABLED, COMPRESSION_MINIMUM_SIZE, GZIP_LEVEL, BROTLI_QUALITY,
+    QUERY_STATS_ENABLED, METRICS_ENABLED, PROFILING_ENABLED
+)
+from compression import CompressionMiddleware
+import query_stats
+import metrics
+import profiling
+import rollups
+import retention
+import migrate
+from routes import users, jobs, materials, spareparts, notifications, reports, admin
 from datetime import datetime
 
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(title="Workshop Manager API", version="1.0.0")
 
+if QUERY_STATS_ENABLED:
+    # Innermost, so the app timing excludes compression
+    query_stats.instrument(engine)
+    if async_engine is not None:
+        query_stats.instrument(async_engine.sync_engine)
+    app.add_middleware(query_stats.QueryStatsMiddleware)
+
+if PROFILING_ENABLED:
+    # Outside the query stats, so its manager check is not counted against the request
+    app.add_middleware(profiling.ProfilerMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://localhost:3000"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, profiling.PROFILE_ID_HEADER],
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MINIMUM_SIZE,
+    gzip_level=GZIP_LEVEL,
+    brotli_quality=BROTLI_QUALITY,
 )
 
+if METRICS_ENABLED:
+    # Outermost, so latency covers compression and in-flight counts every request
+    metrics.instrument_pool(engine)
+    if async_engine is not None:
+        metrics.instrument_pool(async_engine.sync_engine)
+    app.add_middleware(metrics.MetricsMiddleware)
+    app.include_router(metrics.router)
+
+if API_STACK == "async":
+    # Registered first so these handlers shadow their sync twins. CSV imports,
+    # report exports and the SSE stream stay sync
+    import routes_async
+    app.include_router(routes_async.users.router, prefix="/api", tags=["Authentication"])
+    app.include_router(routes_async.jobs.router, prefix="/api", tags=["Jobs"])
+    app.include_router(routes_async.materials.router, prefix="/api", tags=["Materials"])
+    app.include_router(routes_async.spareparts.router, prefix="/api", tags=["Spare Parts"])
+    app.include_router(routes_async.notifications.router, prefix="/api", tags=["Notifications"])
+    app.include_router(routes_async.reports.router, prefix="/api", tags=["Reports"])
+
 app.include_router(users.router, prefix="/api", tags=["Authentication"])
 app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
 app.include_router(materials.router, prefix="/api", tags=["Materials"])
 app.include_router(spareparts.router, prefix="/api", tags=["Spare Parts"])
 app.include_router(notifications.router, prefix="/api", tags=["Notifications"])
 app.include_router(reports.router, prefix="/api", tags=["Reports"])
+app.include_router(admin.router, prefix="/api", tags=["Admin"])
 
 # -------------------------------
 # DATABASE SEED FUNCTION
@@ -132,14 +181,28 @@ def create_default_data():
                     used_date=datetime.now()
                 )
                 db.add(usage)
+                rollups.record_usage(db, rollups.SPARE_PART, part.id, usage.quantity_used, usage.used_date)
                 db.commit()
 
     db.close()
 
 # Call seed function on startup
+background_tasks = []
+
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
+    migrate.ensure_schema()
     create_default_data()
+    if NOTIFICATION_RETENTION_ENABLED:
+        background_tasks.append(asyncio.create_task(retention.run_periodically()))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in background_tasks:
+        task.cancel()
+    shutdown_hash_pool()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 @app.get("/")
 def root():
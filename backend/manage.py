@@ -0,0 +1,87 @@
+import argparse
+import json
+import logging
+import sys
+from database import SessionLocal
+import migrate
+import rollups
+import catalog_import
+import retention
+
+def rebuild_rollups(args):
+    migrate.ensure_schema()
+    db = SessionLocal()
+    try:
+        rollups.rebuild(db)
+    finally:
+        db.close()
+    print("Usage rollups rebuilt")
+
+def import_catalog(args):
+    migrate.ensure_schema()
+    kind = {"materials": rollups.MATERIAL, "spareparts": rollups.SPARE_PART}[args.catalog]
+    db = SessionLocal()
+    try:
+        with open(args.file, encoding="utf-8-sig", newline="") as lines:
+            result = catalog_import.import_catalog(db, kind, lines)
+    except ValueError as e:
+        sys.exit(str(e))
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+
+def enable_incremental_vacuum(args):
+    if retention.enable_incremental_vacuum():
+        print("Database rewritten with auto_vacuum=INCREMENTAL; retention runs now hand pages back")
+    else:
+        print("Nothing to do: not SQLite, or auto_vacuum is already INCREMENTAL")
+
+def db_upgrade(args):
+    migrate.upgrade(args.revision)
+
+def db_downgrade(args):
+    migrate.downgrade(args.revision)
+
+def db_current(args):
+    print(f"current: {migrate.current_revision() or 'none'}  head: {migrate.head_revision()}")
+
+def db_stamp(args):
+    migrate.stamp(args.revision)
+
+def main():
+    parser = argparse.ArgumentParser(description="Workshop Manager maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild-rollups", help="Backfill the daily usage rollup table")
+    rebuild.set_defaults(func=rebuild_rollups)
+
+    importer = commands.add_parser("import-catalog", help="Upsert materials or spare parts from a CSV file")
+    importer.add_argument("catalog", choices=["materials", "spareparts"])
+    importer.add_argument("file")
+    importer.set_defaults(func=import_catalog)
+
+    vacuum = commands.add_parser(
+        "enable-incremental-vacuum", help="One-time VACUUM so notification pruning can shrink the SQLite file"
+    )
+    vacuum.set_defaults(func=enable_incremental_vacuum)
+
+    db = commands.add_parser("db", help="Schema migrations")
+    db_commands = db.add_subparsers(dest="db_command", required=True)
+    upgrade = db_commands.add_parser("upgrade", help="Upgrade to a revision (default: head)")
+    upgrade.add_argument("revision", nargs="?", default="head")
+    upgrade.set_defaults(func=db_upgrade)
+    downgrade = db_commands.add_parser("downgrade", help="Downgrade to a revision, e.g. -1 or 0002")
+    downgrade.add_argument("revision")
+    downgrade.set_defaults(func=db_downgrade)
+    current = db_commands.add_parser("current", help="Show the database and code revisions")
+    current.set_defaults(func=db_current)
+    stamp = db_commands.add_parser("stamp", help="Record a revision without running migrations")
+    stamp.add_argument("revision")
+    stamp.set_defaults(func=db_stamp)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
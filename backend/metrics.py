@@ -0,0 +1,233 @@
+import threading
+import time
+from bisect import bisect_left
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from settings import METRICS_TOKEN
+import notification_broker
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str, labels: tuple = ()):
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _header(self) -> list:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+        return self._header() + [
+            f"{self.name}{_labels(self.label_names, labels)} {value}" for labels, value in sorted(values.items())
+        ]
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, labels: tuple = (), collect=None):
+        super().__init__(name, description, labels)
+        # Optional callable returning {label values: value}, read at scrape time
+        self.collect = collect
+
+    def set(self, *labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> list:
+        if self.collect is not None:
+            values = self.collect()
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return self._header() + [
+            f"{self.name}{_labels(self.label_names, labels)} {value}" for labels, value in sorted(values.items())
+        ]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = buckets
+
+    def observe(self, *labels, value: float):
+        # Only the bucket the value falls in is bumped; render() makes the counts cumulative
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                # One slot per bucket, then +Inf, then the running sum
+                counts = self._values[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def render(self) -> list:
+        with self._lock:
+            values = {labels: list(counts) for labels, counts in self._values.items()}
+        lines = self._header()
+        for labels, counts in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {counts[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+REGISTRY = []
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+# -------------------------------
+# HTTP
+# -------------------------------
+REQUESTS = Counter("http_requests_total", "Requests by route template and status.", ("method", "route", "status"))
+LATENCY = Histogram("http_request_duration_seconds", "Time to the end of the response body.", ("method", "route"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being handled right now.")
+
+# id(route) -> the prefix it was included under, which the route itself does not carry
+_route_prefixes = {}
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        # Unmatched paths share one label so scanners cannot blow up the series count
+        return "unmatched"
+    prefix = _route_prefixes.get(id(route))
+    if prefix is None:
+        path = scope["path"]
+        prefix = next(
+            (path[:i] for i in range(len(path)) if path[i] == "/" and route.path_regex.match(path[i:])), ""
+        )
+        _route_prefixes[id(route)] = prefix
+    return prefix + route.path
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.dec()
+            route = route_template(scope)
+            REQUESTS.inc(scope["method"], route, status)
+            LATENCY.observe(scope["method"], route, value=time.perf_counter() - started)
+
+# -------------------------------
+# Threadpool and database pool
+# -------------------------------
+def _threadpool_usage() -> dict:
+    import anyio.to_thread
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    return {("busy",): limiter.borrowed_tokens, ("limit",): limiter.total_tokens}
+
+THREADPOOL = Gauge(
+    "threadpool_threads", "Worker threads running sync endpoints and dependencies.", ("state",),
+    collect=_threadpool_usage
+)
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+
+_pools = []
+
+def _pool_usage() -> dict:
+    values = {}
+    for pool in _pools:
+        if hasattr(pool, "checkedout"):
+            values[("checked_out",)] = values.get(("checked_out",), 0) + pool.checkedout()
+            values[("size",)] = values.get(("size",), 0) + pool.size()
+    return values
+
+POOL_CONNECTIONS = Gauge("db_pool_connections", "Pooled database connections.", ("state",), collect=_pool_usage)
+
+def instrument_pool(engine):
+    pool = engine.pool
+    do_get = getattr(pool, "_do_get", None)
+    if do_get is None:
+        return
+
+    # _do_get is where QueuePool blocks when every connection is checked out
+    def timed_do_get():
+        started = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            POOL_WAIT.observe(value=time.perf_counter() - started)
+
+    pool._do_get = timed_do_get
+    _pools.append(pool)
+
+# -------------------------------
+# Business events
+# -------------------------------
+STOCK_CONSUMED = Counter("stock_consumption_events_total", "Usage rows booked, by item kind.", ("kind",))
+STOCK_QUANTITY = Counter("stock_consumed_quantity_total", "Units taken off stock, by item kind.", ("kind",))
+LOW_STOCK_ALERTS = Counter("low_stock_alerts_total", "Low-stock alerts raised (one per item crossing, not per manager).")
+SSE_STREAMS = Gauge(
+    "notification_streams_open", "Open /notifications/stream connections.",
+    collect=lambda: {(): notification_broker.open_streams()}
+)
+
+def record_consumption(kind: str, quantity: int):
+    STOCK_CONSUMED.inc(kind)
+    STOCK_QUANTITY.inc(kind, amount=quantity)
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(authorization: str = Header(None)):
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Metrics token required")
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,53 @@
+import os
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from database import engine
+from settings import AUTO_MIGRATE
+
+BASELINE_REVISION = "0001"
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+    # Leave the application's logging alone when migrations run in-process
+    config.attributes["configure_logger"] = False
+    return config
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+def current_revision():
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+def _is_unversioned_legacy_database() -> bool:
+    # Databases built by the old create_all call have tables but no alembic_version
+    tables = inspect(engine).get_table_names()
+    return "users" in tables and "alembic_version" not in tables
+
+def upgrade(revision: str = "head"):
+    config = alembic_config()
+    if _is_unversioned_legacy_database():
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+
+def downgrade(revision: str):
+    command.downgrade(alembic_config(), revision)
+
+def stamp(revision: str):
+    command.stamp(alembic_config(), revision)
+
+def ensure_schema():
+    """Called at startup: create a fresh database, otherwise insist it is at head."""
+    current, head = current_revision(), head_revision()
+    if current == head:
+        return
+    if AUTO_MIGRATE or not inspect(engine).get_table_names():
+        upgrade()
+        return
+    raise RuntimeError(
+        f"Database schema is at revision {current or 'none'} but the code expects {head}. "
+        "Run 'python manage.py db upgrade' (or set AUTO_MIGRATE=1)."
+    )
@@ -0,0 +1,96 @@
+"""Baseline schema as created by Base.metadata.create_all before migrations
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String()),
+        sa.Column("password", sa.String()),
+        sa.Column("name", sa.String()),
+        sa.Column("role", sa.String()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("job_title", sa.String(), nullable=False),
+        sa.Column("assigned_to", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("status", sa.String()),
+        sa.Column("progress", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_jobs_id", "jobs", ["id"])
+
+    op.create_table(
+        "materials",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("material_name", sa.String(), nullable=False),
+        sa.Column("quantity", sa.Integer()),
+        sa.Column("minimum_level", sa.Integer()),
+        sa.Column("unit", sa.String()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_materials_id", "materials", ["id"])
+
+    op.create_table(
+        "spareparts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("part_name", sa.String(), nullable=False),
+        sa.Column("quantity", sa.Integer()),
+        sa.Column("minimum_level", sa.Integer()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_spareparts_id", "spareparts", ["id"])
+
+    op.create_table(
+        "sparepart_usages",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("spare_part_id", sa.Integer(), sa.ForeignKey("spareparts.id")),
+        sa.Column("quantity_used", sa.Integer()),
+        sa.Column("used_by", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("used_date", sa.DateTime()),
+    )
+    op.create_index("ix_sparepart_usages_id", "sparepart_usages", ["id"])
+
+    op.create_table(
+        "material_usages",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("material_id", sa.Integer(), sa.ForeignKey("materials.id")),
+        sa.Column("quantity_used", sa.Integer()),
+        sa.Column("used_by", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("used_date", sa.DateTime()),
+    )
+    op.create_index("ix_material_usages_id", "material_usages", ["id"])
+
+    op.create_table(
+        "notifications",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("is_read", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_notifications_id", "notifications", ["id"])
+
+def downgrade():
+    for table in (
+        "notifications", "material_usages", "sparepart_usages",
+        "spareparts", "materials", "jobs", "users",
+    ):
+        op.drop_table(table)
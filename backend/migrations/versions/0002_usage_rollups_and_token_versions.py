@@ -0,0 +1,56 @@
+"""Token versions, job-linked usages and the daily usage rollup
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("token_version", sa.Integer(), server_default="0"))
+
+    for table in ("sparepart_usages", "material_usages"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column("job_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(f"fk_{table}_job_id_jobs", "jobs", ["job_id"], ["id"])
+
+    op.create_table(
+        "usage_daily_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("item_kind", sa.String(), primary_key=True),
+        sa.Column("item_id", sa.Integer(), primary_key=True),
+        sa.Column("total_used", sa.Integer()),
+        sa.Column("usage_count", sa.Integer()),
+    )
+    op.create_index("ix_usage_daily_rollups_kind_day", "usage_daily_rollups", ["item_kind", "day"])
+
+    # Backfill the rollup from the existing ledgers
+    for kind, table, item_column in (
+        ("material", "material_usages", "material_id"),
+        ("sparepart", "sparepart_usages", "spare_part_id"),
+    ):
+        op.execute(
+            f"INSERT INTO usage_daily_rollups (day, item_kind, item_id, total_used, usage_count) "
+            f"SELECT date(used_date), '{kind}', {item_column}, SUM(quantity_used), COUNT(id) "
+            f"FROM {table} WHERE {item_column} IS NOT NULL "
+            f"GROUP BY date(used_date), {item_column}"
+        )
+
+def downgrade():
+    op.drop_index("ix_usage_daily_rollups_kind_day", table_name="usage_daily_rollups")
+    op.drop_table("usage_daily_rollups")
+
+    for table in ("material_usages", "sparepart_usages"):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f"fk_{table}_job_id_jobs", type_="foreignkey")
+            batch_op.drop_column("job_id")
+
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("token_version")
@@ -0,0 +1,36 @@
+"""Indexes for job board, dashboard, usage ledger and notification queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_jobs_status", "jobs", ["status"]),
+    ("ix_jobs_updated_at_id", "jobs", ["updated_at", "id"]),
+    ("ix_jobs_assigned_to_status", "jobs", ["assigned_to", "status"]),
+    ("ix_sparepart_usages_spare_part_id", "sparepart_usages", ["spare_part_id"]),
+    ("ix_sparepart_usages_used_by", "sparepart_usages", ["used_by"]),
+    ("ix_sparepart_usages_job_id", "sparepart_usages", ["job_id"]),
+    ("ix_sparepart_usages_used_date_id", "sparepart_usages", ["used_date", "id"]),
+    ("ix_material_usages_material_id", "material_usages", ["material_id"]),
+    ("ix_material_usages_used_by", "material_usages", ["used_by"]),
+    ("ix_material_usages_job_id", "material_usages", ["job_id"]),
+    ("ix_material_usages_used_date_id", "material_usages", ["used_date", "id"]),
+    ("ix_notifications_user_read_created", "notifications", ["user_id", "is_read", "created_at"]),
+    ("ix_notifications_user_created_id", "notifications", ["user_id", "created_at", "id"]),
+)
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,38 @@
+"""Write counter for the users table, read by the jobs ETag
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+BUMP = "UPDATE change_counters SET value = value + 1 WHERE name = 'users';"
+
+# Job rows show the assignee's name. Ids can be reused after a delete, so
+# neither counting nor max(id) notices a user being replaced; these triggers do.
+TRIGGERS = (
+    ("trg_users_insert_counter", "AFTER INSERT ON users"),
+    ("trg_users_delete_counter", "AFTER DELETE ON users"),
+    ("trg_users_rename_counter", "AFTER UPDATE OF name ON users"),
+)
+
+def upgrade():
+    op.create_table(
+        "change_counters",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute("INSERT INTO change_counters (name, value) VALUES ('users', 0)")
+    for name, event in TRIGGERS:
+        op.execute(f"CREATE TRIGGER {name} {event} FOR EACH ROW BEGIN {BUMP} END")
+
+def downgrade():
+    for name, _ in reversed(TRIGGERS):
+        op.execute(f"DROP TRIGGER {name}")
+    op.drop_table("change_counters")
@@ -0,0 +1,48 @@
+"""Never hand a deleted user's id to a new account
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Tokens name their user by id, and a new account starts at the token_version
+# an old token may still carry, so an id must never come back
+BUMP = "UPDATE change_counters SET value = value + 1 WHERE name = 'users';"
+TRIGGERS = (
+    ("trg_users_insert_counter", "AFTER INSERT ON users"),
+    ("trg_users_delete_counter", "AFTER DELETE ON users"),
+    ("trg_users_rename_counter", "AFTER UPDATE OF name ON users"),
+)
+
+# Rows that still point at users deleted before this migration; their ids stay retired too
+USER_REFERENCES = (
+    ("users", "id"),
+    ("jobs", "assigned_to"),
+    ("notifications", "user_id"),
+    ("material_usages", "used_by"),
+    ("sparepart_usages", "used_by"),
+)
+
+def _rebuild_users(autoincrement: bool):
+    # The rebuild drops the table's triggers along with it
+    for name, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    with op.batch_alter_table("users", recreate="always", table_kwargs={"sqlite_autoincrement": autoincrement}):
+        pass
+    for name, event in TRIGGERS:
+        op.execute(f"CREATE TRIGGER {name} {event} FOR EACH ROW BEGIN {BUMP} END")
+
+def upgrade():
+    _rebuild_users(True)
+    highest = " UNION ALL ".join(f"SELECT max({column}) AS m FROM {table}" for table, column in USER_REFERENCES)
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'users'")
+    op.execute(f"INSERT INTO sqlite_sequence (name, seq) SELECT 'users', coalesce(max(m), 0) FROM ({highest})")
+
+def downgrade():
+    _rebuild_users(False)
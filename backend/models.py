@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Float, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -11,25 +11,36 @@ class User(Base):
     password = Column(String)
     name = Column(String, default="")
     role = Column(String, default="employee")
+    token_version = Column(Integer, default=0)  # bumped to revoke issued tokens
     
     jobs = relationship("Job", back_populates="assignee")
     spare_part_usages = relationship("SparePartUsage", back_populates="user")
     material_usages = relationship("MaterialUsage", back_populates="user")
     notifications = relationship("Notification", back_populates="user")
 
+    # Ids are never reused, so a deleted user's token cannot pass for a new account
+    __table_args__ = {"sqlite_autoincrement": True}
+
 class Job(Base):
     __tablename__ = "jobs"
     
     id = Column(Integer, primary_key=True, index=True)
     job_title = Column(String, nullable=False)
     assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
-    status = Column(String, default="pending")
+    status = Column(String, default="pending", index=True)
     progress = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
     assignee = relationship("User", back_populates="jobs")
 
+    __table_args__ = (
+        # Keyset pagination on GET /jobs walks (updated_at, id) newest first
+        Index("ix_jobs_updated_at_id", "updated_at", "id"),
+        # Employee dashboard counts are answered from this index alone
+        Index("ix_jobs_assigned_to_status", "assigned_to", "status"),
+    )
+
 class Material(Base):
     __tablename__ = "materials"
     
@@ -53,26 +64,49 @@ class SparePartUsage(Base):
     __tablename__ = "sparepart_usages"
     
     id = Column(Integer, primary_key=True, index=True)
-    spare_part_id = Column(Integer, ForeignKey("spareparts.id"))
+    spare_part_id = Column(Integer, ForeignKey("spareparts.id"), index=True)
     quantity_used = Column(Integer, default=1)
-    used_by = Column(Integer, ForeignKey("users.id"))
+    used_by = Column(Integer, ForeignKey("users.id"), index=True)
     used_date = Column(DateTime, default=datetime.now)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True, index=True)  # set when booked against a job
     
     spare_part = relationship("SparePart")
     user = relationship("User", back_populates="spare_part_usages")
 
+    __table_args__ = (
+        Index("ix_sparepart_usages_used_date_id", "used_date", "id"),
+    )
+
 class MaterialUsage(Base):
     __tablename__ = "material_usages"
     
     id = Column(Integer, primary_key=True, index=True)
-    material_id = Column(Integer, ForeignKey("materials.id"))
+    material_id = Column(Integer, ForeignKey("materials.id"), index=True)
     quantity_used = Column(Integer, default=1)
-    used_by = Column(Integer, ForeignKey("users.id"))
+    used_by = Column(Integer, ForeignKey("users.id"), index=True)
     used_date = Column(DateTime, default=datetime.now)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True, index=True)  # set when booked against a job
     
     material = relationship("Material")
     user = relationship("User", back_populates="material_usages")
 
+    __table_args__ = (
+        Index("ix_material_usages_used_date_id", "used_date", "id"),
+    )
+
+class UsageDailyRollup(Base):
+    __tablename__ = "usage_daily_rollups"
+    
+    day = Column(Date, primary_key=True)
+    item_kind = Column(String, primary_key=True)  # "material" or "sparepart"
+    item_id = Column(Integer, primary_key=True)
+    total_used = Column(Integer, default=0)
+    usage_count = Column(Integer, default=0)
+
+    __table_args__ = (
+        Index("ix_usage_daily_rollups_kind_day", "item_kind", "day"),
+    )
+
 class Notification(Base):
     __tablename__ = "notifications"
     
@@ -83,4 +117,18 @@ class Notification(Base):
     is_read = Column(Integer, default=0)  # 0 for false, 1 for true
     created_at = Column(DateTime, default=datetime.now)
 
-    user = relationship("User", back_populates="notifications")
\ No newline at end of file
+    user = relationship("User", back_populates="notifications")
+
+    __table_args__ = (
+        # Unread counts and unread-only pages for one user
+        Index("ix_notifications_user_read_created", "user_id", "is_read", "created_at"),
+        # The dropdown's newest-first page across read and unread
+        Index("ix_notifications_user_created_id", "user_id", "created_at", "id"),
+    )
+
+class ChangeCounter(Base):
+    """Bumped by triggers (migration 0004) on writes that no timestamp column records."""
+    __tablename__ = "change_counters"
+    
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
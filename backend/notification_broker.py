@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from settings import SSE_QUEUE_SIZE
+
+# Put on a subscriber's queue when it overflowed; the stream then re-reads from the database
+RESYNC = object()
+
+# user_id -> set of (event loop, queue) for every open stream of that user
+_subscribers = {}
+_subscribers_lock = threading.Lock()
+
+def subscribe(user_id: int):
+    entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=SSE_QUEUE_SIZE))
+    with _subscribers_lock:
+        _subscribers.setdefault(user_id, set()).add(entry)
+    return entry
+
+def unsubscribe(user_id: int, entry):
+    with _subscribers_lock:
+        entries = _subscribers.get(user_id)
+        if entries is not None:
+            entries.discard(entry)
+            if not entries:
+                del _subscribers[user_id]
+
+def open_streams() -> int:
+    with _subscribers_lock:
+        return sum(len(entries) for entries in _subscribers.values())
+
+def _offer(queue: asyncio.Queue, item):
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        # Drop the backlog rather than block publishers; the reader catches up from its last id
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC)
+
+def publish(notification: dict):
+    """Hand a committed notification to the user's open streams. Safe from any thread."""
+    with _subscribers_lock:
+        entries = list(_subscribers.get(notification["user_id"], ()))
+    for loop, queue in entries:
+        loop.call_soon_threadsafe(_offer, queue, notification)
+
+def publish_after_commit(db: Session, notifications, on_commit=None):
+    # Held on the session so a rolled back transaction never reaches a browser;
+    # on_commit runs alongside, e.g. to count an event only once it is durable
+    db.info.setdefault("pending_notifications", []).extend(notifications)
+    if on_commit is not None:
+        db.info.setdefault("pending_callbacks", []).append(on_commit)
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session):
+    for notification in session.info.pop("pending_notifications", ()):
+        publish(notification)
+    for callback in session.info.pop("pending_callbacks", ()):
+        callback()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop("pending_notifications", None)
+    session.info.pop("pending_callbacks", None)
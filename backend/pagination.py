@@ -0,0 +1,39 @@
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    raw = f"{ts.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_filter(query, ts_column, id_column, cursor: Optional[str]):
+    # Rows are ordered newest first, so the next page starts strictly after the cursor
+    position = decode_cursor(cursor)
+    if position is None:
+        return query
+    ts, row_id = position
+    return query.filter(
+        (ts_column < ts) | ((ts_column == ts) & (id_column < row_id))
+    )
+
+def split_page(rows, limit: int, key):
+    # Callers fetch limit + 1 rows; the extra row only signals that another page exists
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
@@ -0,0 +1,212 @@
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import Context, ContextVar
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from database import SessionLocal
+from dependencies import get_current_user, PRIVILEGED_ROLES
+from settings import PROFILE_INTERVAL_MS, PROFILE_MAX_SECONDS, PROFILE_BUFFER_SIZE
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+# Stand-in stack for ticks where none of the request's code was on a CPU
+WAITING = ("(waiting: awaiting I/O, the event loop or a worker thread)",)
+
+_ids = itertools.count(1)
+_profiles = deque(maxlen=PROFILE_BUFFER_SIZE)
+_profiles_lock = threading.Lock()
+
+# Set while a profiled request runs; threadpool calls inherit it through their copied context
+_active: ContextVar = ContextVar("active_profile", default=None)
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class Profile:
+    """Samples the stacks of the threads working on one request.
+
+    On the event loop thread a sample counts when the request's middleware
+    frame is in the stack, i.e. the request's task is the one running. A
+    worker thread counts when the context it was handed by the threadpool
+    carries this profile.
+    """
+
+    def __init__(self, method: str, path: str):
+        self.id = next(_ids)
+        self.method = method
+        self.path = path
+        self.started_at = datetime.now()
+        self.duration_ms = 0.0
+        self.stacks = Counter()
+        self.samples = []
+        self._stop = threading.Event()
+
+    def start(self, loop_thread: int, request_frame):
+        self._loop_thread = loop_thread
+        self._request_frame = request_frame
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{self.id}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        # The frames are only needed while sampling
+        self._request_frame = None
+
+    def _belongs(self, thread_id: int, chain: list) -> bool:
+        if thread_id == self._loop_thread:
+            return any(frame is self._request_frame for frame in chain)
+        # A threadpool worker keeps the task's Context in a local a few frames above the thread's root
+        return any(
+            isinstance(value, Context) and value.get(_active) is self
+            for frame in chain[-4:]
+            for value in frame.f_locals.values()
+        )
+
+    def _sample(self) -> list:
+        own = threading.get_ident()
+        stacks = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            chain = []
+            while frame is not None:
+                chain.append(frame)
+                frame = frame.f_back
+            if self._belongs(thread_id, chain):
+                label = "event loop" if thread_id == self._loop_thread else "worker thread"
+                stacks.append((label,) + tuple(_frame_name(f) for f in reversed(chain)))
+        return stacks or [WAITING]
+
+    def _run(self):
+        last = self._started
+        deadline = self._started + PROFILE_MAX_SECONDS
+        while not self._stop.wait(PROFILE_INTERVAL_MS / 1000):
+            now = time.perf_counter()
+            if now > deadline:
+                break
+            weight = (now - last) * 1000
+            last = now
+            for stack in self._sample():
+                self.stacks[stack] += 1
+                self.samples.append((stack, weight))
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": len(self.samples),
+        }
+
+    def collapsed(self) -> str:
+        # Brendan Gregg's folded format, read by flamegraph.pl, speedscope and most flame graph tools
+        return "".join(
+            ";".join(name.replace(";", ":") for name in stack) + f" {count}\n"
+            for stack, count in sorted(self.stacks.items())
+        )
+
+    def speedscope(self) -> dict:
+        frames, index = [], {}
+        samples, weights = [], []
+        for stack, weight in self.samples:
+            ids = []
+            for name in stack:
+                if name not in index:
+                    index[name] = len(frames)
+                    frames.append({"name": name})
+                ids.append(index[name])
+            samples.append(ids)
+            weights.append(round(weight, 3))
+        name = f"{self.method} {self.path}"
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+def recent() -> list:
+    with _profiles_lock:
+        return [profile.summary() for profile in reversed(_profiles)]
+
+def get(profile_id: int) -> Optional[Profile]:
+    with _profiles_lock:
+        return next((profile for profile in _profiles if profile.id == profile_id), None)
+
+def _requested(scope: Scope) -> bool:
+    if b"profile=" in scope["query_string"]:
+        for pair in scope["query_string"].split(b"&"):
+            if pair in (b"profile=1", b"profile=true"):
+                return True
+    return any(name == b"x-profile" and value in (b"1", b"true") for name, value in scope["headers"])
+
+def _privileged_user_from_token(token: str):
+    db = SessionLocal()
+    try:
+        user = get_current_user(token, db)
+    except HTTPException:
+        return None
+    finally:
+        db.close()
+    return user if user.role in PRIVILEGED_ROLES else None
+
+class ProfilerMiddleware:
+    """Profile a request sent with "X-Profile: 1" or "?profile=1" by a manager or admin.
+
+    Other requests pay for one header scan. The profile is kept in memory and
+    its id returned in the X-Profile-Id header; flags from anyone else are
+    ignored and the request runs unprofiled.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+        scheme, _, token = authorization.partition(" ")
+        user = await run_in_threadpool(_privileged_user_from_token, token) if scheme.lower() == "bearer" and token else None
+        if user is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(scope["method"], scope["path"])
+
+        async def send_with_id(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, str(profile.id))
+            await send(message)
+
+        reset = _active.set(profile)
+        profile.start(threading.get_ident(), sys._getframe())
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.stop()
+            _active.reset(reset)
+            with _profiles_lock:
+                _profiles.append(profile)
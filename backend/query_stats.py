@@ -0,0 +1,120 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from settings import N1_QUERY_THRESHOLD, N1_QUERY_ACTION
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists would otherwise give every list length its own shape
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+class RepeatedQueryError(RuntimeError):
+    """Raised in "raise" mode when one statement shape repeats past the threshold."""
+
+class RequestQueryStats:
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.flagged = set()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.duration += elapsed
+        if N1_QUERY_ACTION == "off":
+            return
+        shape = _WHITESPACE.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+        self.shapes[shape] += 1
+        if self.shapes[shape] > N1_QUERY_THRESHOLD and shape not in self.flagged:
+            self.flagged.add(shape)
+            message = (
+                f"Possible N+1 in {self.method} {self.path}: "
+                f"statement ran more than {N1_QUERY_THRESHOLD} times: {shape[:300]}"
+            )
+            if N1_QUERY_ACTION == "raise":
+                raise RepeatedQueryError(message)
+            logger.warning(message)
+
+    def server_timing(self) -> str:
+        noun = "query" if self.count == 1 else "queries"
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} {noun}"'
+
+# The threadpool copies the request's context, so sync endpoints and
+# dependencies such as get_db's session report into the same object
+_current: ContextVar = ContextVar("request_query_stats", default=None)
+
+def current():
+    """The stats object of the request being served, or None outside a request."""
+    return _current.get()
+
+# Callbacks handed every timed statement, so other diagnostics reuse this one timing hook
+_observers = []
+
+def observe(callback):
+    """Call callback(conn, statement, parameters, executemany, elapsed) after each statement."""
+    if callback not in _observers:
+        _observers.append(callback)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    for callback in _observers:
+        callback(conn, statement, parameters, executemany, elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+def instrument(engine):
+    # Async engines are instrumented through their sync_engine; safe to call more than once
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+class QueryStatsMiddleware:
+    """Count each request's statements and DB time and report them in Server-Timing.
+
+    Statements run after the response has started, such as those behind a
+    streamed export, are counted but miss the header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope["method"], scope["path"])
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                app_ms = (time.perf_counter() - started) * 1000
+                headers.append("Server-Timing", f"{stats.server_timing()}, app;dur={app_ms:.2f}")
+            await send(message)
+
+        reset = _current.set(stats)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(reset)
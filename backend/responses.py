@@ -0,0 +1,13 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+class ORJSONResponse(JSONResponse):
+    """JSON rendered by orjson, for routes that build plain dicts and lists.
+
+    Returning it directly skips FastAPI's jsonable_encoder walk. Routes with
+    a response_model are better left alone: FastAPI already serializes
+    those to bytes in pydantic-core.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import Session
+from database import SessionLocal, engine, is_sqlite
+from models import Notification
+from settings import (
+    NOTIFICATION_READ_RETENTION_DAYS, NOTIFICATION_UNREAD_RETENTION_DAYS, NOTIFICATION_KEEP_PER_USER,
+    NOTIFICATION_RETENTION_INTERVAL_SECONDS, NOTIFICATION_RETENTION_BATCH_SIZE,
+    SQLITE_INCREMENTAL_VACUUM_PAGES
+)
+
+logger = logging.getLogger(__name__)
+
+def _delete_in_batches(db: Session, ids_to_delete) -> int:
+    # Small committed batches keep the write lock short so consumption requests are not held up
+    deleted = 0
+    while True:
+        batch = ids_to_delete.limit(NOTIFICATION_RETENTION_BATCH_SIZE).scalar_subquery()
+        count = db.execute(
+            delete(Notification).where(Notification.id.in_(batch)).execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        deleted += count
+        if count < NOTIFICATION_RETENTION_BATCH_SIZE:
+            return deleted
+
+def prune_notifications(db: Session) -> int:
+    """Apply every enabled retention policy and return the number of rows deleted."""
+    deleted = 0
+    now = datetime.now()
+    if NOTIFICATION_READ_RETENTION_DAYS > 0:
+        cutoff = now - timedelta(days=NOTIFICATION_READ_RETENTION_DAYS)
+        deleted += _delete_in_batches(db, select(Notification.id).where(
+            Notification.is_read == 1, Notification.created_at < cutoff
+        ))
+    if NOTIFICATION_UNREAD_RETENTION_DAYS > 0:
+        cutoff = now - timedelta(days=NOTIFICATION_UNREAD_RETENTION_DAYS)
+        deleted += _delete_in_batches(db, select(Notification.id).where(
+            Notification.created_at < cutoff
+        ))
+    if NOTIFICATION_KEEP_PER_USER > 0:
+        ranked = select(
+            Notification.id,
+            func.row_number().over(
+                partition_by=Notification.user_id,
+                order_by=(Notification.created_at.desc(), Notification.id.desc())
+            ).label("position")
+        ).subquery()
+        deleted += _delete_in_batches(db, select(ranked.c.id).where(
+            ranked.c.position > NOTIFICATION_KEEP_PER_USER
+        ))
+    return deleted
+
+_warned_no_incremental_vacuum = False
+
+def reclaim_space(db: Session):
+    global _warned_no_incremental_vacuum
+    if not is_sqlite:
+        return
+    # Only databases created with auto_vacuum=INCREMENTAL can give pages back without a full VACUUM
+    if db.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+        if not _warned_no_incremental_vacuum:
+            _warned_no_incremental_vacuum = True
+            logger.warning(
+                "Pruned notifications leave free pages in the database file: it predates "
+                "auto_vacuum=INCREMENTAL. Run 'python manage.py enable-incremental-vacuum' once to convert it."
+            )
+        return
+    # sqlite3's execute() steps this pragma once, freeing a single page; executescript runs it to completion
+    raw_connection = db.connection().connection.dbapi_connection
+    raw_connection.executescript(f"PRAGMA incremental_vacuum({SQLITE_INCREMENTAL_VACUUM_PAGES});")
+    db.commit()
+
+def enable_incremental_vacuum() -> bool:
+    """Convert an existing SQLite file to auto_vacuum=INCREMENTAL.
+
+    The mode only changes through a full VACUUM, which rewrites the file and
+    holds an exclusive lock while it runs. Returns False when the database
+    is not SQLite or was already converted.
+    """
+    if not is_sqlite:
+        return False
+    raw_connection = engine.raw_connection()
+    try:
+        if raw_connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        # executescript commits any open transaction first; VACUUM cannot run inside one
+        raw_connection.executescript("PRAGMA auto_vacuum=INCREMENTAL; VACUUM;")
+        return True
+    finally:
+        raw_connection.close()
+
+def run_once() -> int:
+    db = SessionLocal()
+    try:
+        deleted = prune_notifications(db)
+        reclaim_space(db)
+        return deleted
+    finally:
+        db.close()
+
+async def run_periodically():
+    while True:
+        try:
+            deleted = await asyncio.to_thread(run_once)
+            if deleted:
+                logger.info("Notification retention removed %d rows", deleted)
+        except Exception:
+            logger.exception("Notification retention run failed")
+        await asyncio.sleep(NOTIFICATION_RETENTION_INTERVAL_SECONDS)
@@ -0,0 +1,63 @@
+from datetime import datetime
+from sqlalchemy import func, literal
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from models import UsageDailyRollup, MaterialUsage, SparePartUsage
+
+MATERIAL = "material"
+SPARE_PART = "sparepart"
+
+GRANULARITIES = ("day", "week", "month")
+
+def record_usage(db: Session, item_kind: str, item_id: int, quantity: int, used_at: datetime):
+    # Runs inside the caller's transaction so the rollup commits with the usage row
+    record_usages(db, used_at, {(item_kind, item_id): (quantity, 1)})
+
+def record_usages(db: Session, used_at: datetime, totals: dict):
+    """Add several items' usage on one day to the rollup in one executemany upsert.
+
+    totals maps (item kind, item id) to (quantity used, number of usage rows).
+    """
+    stmt = insert(UsageDailyRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day", "item_kind", "item_id"],
+        set_={
+            "total_used": UsageDailyRollup.total_used + stmt.excluded.total_used,
+            "usage_count": UsageDailyRollup.usage_count + stmt.excluded.usage_count,
+        }
+    )
+    db.execute(stmt, [
+        {"day": used_at.date(), "item_kind": kind, "item_id": item_id, "total_used": quantity, "usage_count": count}
+        for (kind, item_id), (quantity, count) in totals.items()
+    ])
+
+def period_column(granularity: str):
+    if granularity == "week":
+        # Monday of the week the day falls in
+        return func.date(UsageDailyRollup.day, "weekday 0", "-6 days")
+    if granularity == "month":
+        return func.strftime("%Y-%m", UsageDailyRollup.day)
+    return UsageDailyRollup.day
+
+def rebuild(db: Session):
+    """Recompute every rollup row from the usage ledgers."""
+    db.query(UsageDailyRollup).delete()
+    for kind, usage, item_column in (
+        (MATERIAL, MaterialUsage, MaterialUsage.material_id),
+        (SPARE_PART, SparePartUsage, SparePartUsage.spare_part_id),
+    ):
+        day = func.date(usage.used_date)
+        source = db.query(
+            day,
+            literal(kind),
+            item_column,
+            func.sum(usage.quantity_used),
+            func.count(usage.id)
+        ).filter(item_column.isnot(None)).group_by(day, item_column)
+        db.execute(
+            UsageDailyRollup.__table__.insert().from_select(
+                ["day", "item_kind", "item_id", "total_used", "usage_count"],
+                source.statement
+            )
+        )
+    db.commit()
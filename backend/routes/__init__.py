@@ -3,4 +3,5 @@ from . import jobs
 from . import materials
 from . import spareparts
 from . import notifications
-from . import reports
\ No newline at end of file
+from . import reports
+from . import admin
\ No newline at end of file
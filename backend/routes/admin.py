@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+from typing import List
+from models import User
+from schemas import SlowQuery, ProfileSummary
+from dependencies import get_current_user, PRIVILEGED_ROLES
+import slow_queries
+import profiling
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+def _require_privileged(current_user: User):
+    if current_user.role not in PRIVILEGED_ROLES:
+        raise HTTPException(status_code=403, detail="Only managers and admins can view diagnostics")
+
+@router.get("/slow-queries", response_model=List[SlowQuery])
+def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    sort: str = Query("recent", pattern="^(recent|slowest)$"),
+    current_user: User = Depends(get_current_user)
+):
+    _require_privileged(current_user)
+    return slow_queries.recent(limit, slowest_first=sort == "slowest")
+
+@router.delete("/slow-queries")
+def clear_slow_queries(current_user: User = Depends(get_current_user)):
+    _require_privileged(current_user)
+    return {"message": "Slow query log cleared", "deleted": slow_queries.clear()}
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+def get_profiles(current_user: User = Depends(get_current_user)):
+    _require_privileged(current_user)
+    return profiling.recent()
+
+@router.get("/profiles/{profile_id}")
+def get_profile(
+    profile_id: int,
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$"),
+    current_user: User = Depends(get_current_user)
+):
+    _require_privileged(current_user)
+    profile = profiling.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(
+            profile.collapsed(),
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'}
+        )
+    return JSONResponse(
+        profile.speedscope(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'}
+    )
@@ -1,41 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from models import Job, User
-from schemas import JobCreate, JobResponse, JobUpdate
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime
+from models import Job, User, MaterialUsage, SparePartUsage
+from schemas import JobCreate, JobResponse, JobUpdate, ConsumptionBatch, ConsumptionBatchResponse
 from dependencies import get_db, get_current_user
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_filter, split_page
+from stock import STOCK_MODELS, consume_stock_many, stock_levels
+from conditional import job_version_statement, check_not_modified
+import rollups
+import alerts
+import metrics
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
+# kind -> (usage ledger model, its item column, label used in messages)
+USAGE_MODELS = {
+    rollups.MATERIAL: (MaterialUsage, "material_id", "Material"),
+    rollups.SPARE_PART: (SparePartUsage, "spare_part_id", "Spare part"),
+}
+
+def job_statement():
+    # The assignee is joined in, so reading assigned_name never issues another query
+    return select(Job).options(joinedload(Job.assignee))
+
+def job_page_statement(limit: int, cursor: Optional[str]):
+    stmt = keyset_filter(job_statement(), Job.updated_at, Job.id, cursor)
+    return stmt.order_by(Job.updated_at.desc(), Job.id.desc()).limit(limit + 1)
+
+def serialize_job(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "job_title": job.job_title,
+        "assigned_to": job.assigned_to,
+        "status": job.status,
+        "progress": job.progress,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "assigned_name": job.assignee.name if job.assignee else None
+    }
+
 @router.get("/", response_model=List[JobResponse])
 def get_jobs(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    jobs = db.query(Job).all()
-    
-    # Add assigned_name to each job
-    result = []
-    for job in jobs:
-        job_dict = {
-            "id": job.id,
-            "job_title": job.job_title,
-            "assigned_to": job.assigned_to,
-            "status": job.status,
-            "progress": job.progress,
-            "created_at": job.created_at,
-            "updated_at": job.updated_at
-        }
-        
-        if job.assigned_to:
-            assignee = db.query(User).filter(User.id == job.assigned_to).first()
-            job_dict["assigned_name"] = assignee.name if assignee else None
-        else:
-            job_dict["assigned_name"] = None
-            
-        result.append(job_dict)
-    
-    return result
+    version = db.execute(job_version_statement()).one()
+    not_modified = check_not_modified(request, response, version, limit, cursor)
+    if not_modified:
+        return not_modified
+    
+    jobs = db.execute(job_page_statement(limit, cursor)).scalars().all()
+    
+    jobs, next_cursor = split_page(jobs, limit, lambda j: (j.updated_at, j.id))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    return [serialize_job(job) for job in jobs]
 
 @router.post("/", response_model=JobResponse)
 def create_job(
@@ -49,23 +76,8 @@ def create_job(
     new_job = Job(**job.dict())
     db.add(new_job)
     db.commit()
-    db.refresh(new_job)
-    
-    result = {
-        "id": new_job.id,
-        "job_title": new_job.job_title,
-        "assigned_to": new_job.assigned_to,
-        "status": new_job.status,
-        "progress": new_job.progress,
-        "created_at": new_job.created_at,
-        "updated_at": new_job.updated_at
-    }
     
-    if new_job.assigned_to:
-        assignee = db.query(User).filter(User.id == new_job.assigned_to).first()
-        result["assigned_name"] = assignee.name if assignee else None
-    
-    return result
+    return serialize_job(db.execute(job_statement().filter(Job.id == new_job.id)).scalar_one())
 
 @router.put("/{job_id}", response_model=JobResponse)
 def update_job(
@@ -83,23 +95,8 @@ def update_job(
         setattr(job, field, value)
     
     db.commit()
-    db.refresh(job)
     
-    result = {
-        "id": job.id,
-        "job_title": job.job_title,
-        "assigned_to": job.assigned_to,
-        "status": job.status,
-        "progress": job.progress,
-        "created_at": job.created_at,
-        "updated_at": job.updated_at
-    }
-    
-    if job.assigned_to:
-        assignee = db.query(User).filter(User.id == job.assigned_to).first()
-        result["assigned_name"] = assignee.name if assignee else None
-    
-    return result
+    return serialize_job(db.execute(job_statement().filter(Job.id == job_id)).scalar_one())
 
 @router.delete("/{job_id}")
 def delete_job(
@@ -124,4 +121,105 @@ def get_employees(
     current_user: User = Depends(get_current_user)
 ):
     employees = db.query(User).filter(User.role == "employee").all()
-    return [{"id": e.id, "name": e.name} for e in employees]
\ No newline at end of file
+    return [{"id": e.id, "name": e.name} for e in employees]
+
+@router.post("/{job_id}/consume", response_model=ConsumptionBatchResponse)
+def consume_for_job(
+    job_id: int,
+    batch: ConsumptionBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if not batch.lines:
+        raise HTTPException(status_code=400, detail="No lines to book")
+    if db.query(Job.id).filter(Job.id == job_id).first() is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    # Quantities are summed per item so two lines for one item are checked together
+    requested = defaultdict(int)
+    item_ids = defaultdict(list)
+    for line in batch.lines:
+        requested[(line.kind, line.item_id)] += line.quantity
+        item_ids[line.kind].append(line.item_id)
+    levels = stock_levels(db, item_ids)
+    
+    errors = []
+    for index, line in enumerate(batch.lines):
+        key = (line.kind, line.item_id)
+        if line.quantity <= 0:
+            errors.append({"line": index, "error": "Quantity must be positive"})
+        elif key not in levels:
+            errors.append({"line": index, "error": f"{USAGE_MODELS[line.kind][2]} not found"})
+        elif levels[key].quantity < requested[key]:
+            errors.append({"line": index, "error": f"Not enough stock available ({levels[key].quantity} in stock)"})
+    if errors:
+        raise HTTPException(status_code=400, detail={"message": "No items were booked", "errors": errors})
+    
+    # The conditional decrements still guard against stock taken since the read above;
+    # each kind is one UPDATE however many items the batch holds
+    remaining = {}
+    for kind, (model, name_column) in STOCK_MODELS.items():
+        quantities = {item_id: quantity for (k, item_id), quantity in requested.items() if k == kind}
+        if not quantities:
+            continue
+        rows = consume_stock_many(db, model, quantities, name_column.label("name"))
+        short = [item_id for item_id in quantities if item_id not in rows]
+        if short:
+            db.rollback()
+            errors = [
+                {"line": index, "error": "Not enough stock available"}
+                for index, line in enumerate(batch.lines)
+                if line.kind == kind and line.item_id in short
+            ]
+            raise HTTPException(status_code=409, detail={"message": "No items were booked", "errors": errors})
+        remaining.update({(kind, item_id): row for item_id, row in rows.items()})
+    
+    used_date = datetime.now()
+    usage_ids = defaultdict(list)
+    for kind, (usage_model, item_field, _) in USAGE_MODELS.items():
+        rows = [
+            {item_field: line.item_id, "quantity_used": line.quantity, "used_by": current_user.id,
+             "used_date": used_date, "job_id": job_id}
+            for line in batch.lines if line.kind == kind
+        ]
+        if not rows:
+            continue
+        # One multi-row INSERT per ledger; SQLite does not promise RETURNING order,
+        # but lines with the same item and quantity are interchangeable
+        created = db.execute(
+            insert(usage_model).values(rows).returning(
+                usage_model.id, getattr(usage_model, item_field).label("item_id"), usage_model.quantity_used
+            )
+        )
+        for row in created:
+            usage_ids[(kind, row.item_id, row.quantity_used)].append(row.id)
+    # All lines share used_date, so the rollup takes one row per item
+    lines_per_item = defaultdict(int)
+    for line in batch.lines:
+        lines_per_item[(line.kind, line.item_id)] += 1
+    rollups.record_usages(db, used_date, {key: (requested[key], lines_per_item[key]) for key in requested})
+    
+    low_items = [
+        f"{USAGE_MODELS[kind][2]} {row.name} ({row.quantity} remaining)"
+        for (kind, item_id), row in remaining.items()
+        if alerts.crossed_low_stock(row.quantity, row.minimum_level, requested[(kind, item_id)])
+    ]
+    if low_items:
+        # One alert per manager for the whole batch
+        alerts.fire_low_stock_alert(db, f"Running low after job #{job_id}: {', '.join(low_items)}.")
+    
+    results = [
+        {
+            "kind": line.kind,
+            "item_id": line.item_id,
+            "usage_id": usage_ids[(line.kind, line.item_id, line.quantity)].pop(),
+            "quantity_used": line.quantity,
+            "remaining": remaining[(line.kind, line.item_id)].quantity
+        }
+        for line in batch.lines
+    ]
+    db.commit()
+    for line in batch.lines:
+        metrics.record_consumption(line.kind, line.quantity)
+    
+    return {"job_id": job_id, "used_date": used_date, "results": results}
@@ -1,17 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
-from models import Material, User, MaterialUsage, Notification
-from schemas import MaterialCreate, MaterialResponse, MaterialUpdate, MaterialUsageCreate, MaterialUsageResponse
+from datetime import datetime
+from models import Material, User, MaterialUsage
+from schemas import MaterialCreate, MaterialResponse, MaterialUpdate, MaterialUsageCreate, MaterialUsageResponse, ImportResult
 from dependencies import get_db, get_current_user
+import rollups
+import alerts
+import metrics
+import catalog_import
+from stock import consume_stock, raise_stock_error
+from conditional import catalog_version_statement, check_not_modified
 
 router = APIRouter(prefix="/materials", tags=["Materials"])
 
 @router.get("/", response_model=List[MaterialResponse])
 def get_materials(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    version = db.execute(catalog_version_statement(Material)).one()
+    not_modified = check_not_modified(request, response, version)
+    if not_modified:
+        return not_modified
     return db.query(Material).all()
 
 @router.post("/", response_model=MaterialResponse)
@@ -29,6 +42,15 @@ def create_material(
     db.refresh(new_material)
     return new_material
 
+@router.post("/import", response_model=ImportResult)
+async def import_materials(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Streams a text/csv body; rows are upserted by name in chunked transactions
+    return await catalog_import.import_upload(request, db, current_user, rollups.MATERIAL)
+
 @router.put("/{material_id}", response_model=MaterialResponse)
 def update_material(
     material_id: int,
@@ -43,10 +65,16 @@ def update_material(
     if not material:
         raise HTTPException(status_code=404, detail="Material not found")
     
+    was_quantity, was_minimum = material.quantity, material.minimum_level
     update_data = material_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(material, field, value)
     
+    if alerts.became_low(was_quantity, was_minimum, material.quantity, material.minimum_level):
+        alerts.fire_low_stock_alert(
+            db, f"Material {material.material_name} is running low ({material.quantity} remaining)."
+        )
+    
     db.commit()
     db.refresh(material)
     return material
@@ -75,35 +103,27 @@ def use_material(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    material = db.query(Material).filter(Material.id == material_id).first()
-    if not material:
-        raise HTTPException(status_code=404, detail="Material not found")
-        
-    if material.quantity < usage.quantity_used:
-        raise HTTPException(status_code=400, detail="Not enough stock available")
-        
-    material.quantity -= usage.quantity_used
+    material = consume_stock(db, Material, material_id, usage.quantity_used, Material.material_name)
+    if material is None:
+        raise_stock_error(db, Material, material_id, "Material not found")
     
     new_usage = MaterialUsage(
         material_id=material_id,
         quantity_used=usage.quantity_used,
-        used_by=current_user.id
+        used_by=current_user.id,
+        used_date=datetime.now()
     )
     db.add(new_usage)
+    rollups.record_usage(db, rollups.MATERIAL, material_id, usage.quantity_used, new_usage.used_date)
     
     # Check for low stock alert
-    if material.quantity <= material.minimum_level:
-        managers = db.query(User).filter(User.role == "manager").all()
-        for mgr in managers:
-            notification = Notification(
-                user_id=mgr.id,
-                title="Low Stock Alert",
-                message=f"Material {material.material_name} is running low ({material.quantity} remaining).",
-                is_read=0
-            )
-            db.add(notification)
+    if alerts.crossed_low_stock(material.quantity, material.minimum_level, usage.quantity_used):
+        alerts.fire_low_stock_alert(
+            db, f"Material {material.material_name} is running low ({material.quantity} remaining)."
+        )
             
     db.commit()
+    metrics.record_consumption(rollups.MATERIAL, usage.quantity_used)
     db.refresh(new_usage)
     
     return {
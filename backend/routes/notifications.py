@@ -1,21 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from database import SessionLocal
 from models import Notification, User
-from schemas import NotificationResponse
-from dependencies import get_db, get_current_user
+from schemas import NotificationResponse, NotificationMarkRead, UnreadCount, StreamToken
+from dependencies import get_db, get_current_user, optional_oauth2_scheme, issue_stream_token, stream_token_user_id
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_filter, split_page
+from settings import SSE_HEARTBEAT_SECONDS, STREAM_TOKEN_TTL_SECONDS
+import notification_broker
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
+def notification_page_statement(user_id: int, unread_only: bool, limit: int, cursor: Optional[str]):
+    stmt = select(Notification).filter(Notification.user_id == user_id)
+    if unread_only:
+        stmt = stmt.filter(Notification.is_read == 0)
+    stmt = keyset_filter(stmt, Notification.created_at, Notification.id, cursor)
+    return stmt.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1)
+
+def unread_count_statement(user_id: int):
+    return select(func.count(Notification.id)).filter(
+        Notification.user_id == user_id,
+        Notification.is_read == 0
+    )
+
+def serialize_notification_page(response: Response, notifications, limit: int):
+    notifications, next_cursor = split_page(notifications, limit, lambda n: (n.created_at, n.id))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return notifications
+
 @router.get("/", response_model=List[NotificationResponse])
 def get_notifications(
+    response: Response,
+    unread_only: bool = False,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    notifications = db.query(Notification).filter(
-        Notification.user_id == current_user.id
-    ).order_by(Notification.created_at.desc()).all()
-    return notifications
+    notifications = db.execute(
+        notification_page_statement(current_user.id, unread_only, limit, cursor)
+    ).scalars().all()
+    return serialize_notification_page(response, notifications, limit)
+
+@router.get("/unread-count", response_model=UnreadCount)
+def get_unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return {"unread": db.execute(unread_count_statement(current_user.id)).scalar()}
+
+@router.put("/read")
+def mark_many_as_read(
+    body: NotificationMarkRead,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # One UPDATE for the whole selection instead of a request per notification
+    stmt = update(Notification).where(
+        Notification.user_id == current_user.id,
+        Notification.is_read == 0
+    )
+    if body.ids is not None:
+        stmt = stmt.where(Notification.id.in_(body.ids))
+    updated = db.execute(stmt.values(is_read=1).execution_options(synchronize_session=False)).rowcount
+    db.commit()
+    return {"message": "Notifications marked as read", "updated": updated}
 
 @router.put("/{notification_id}/read")
 def mark_as_read(
@@ -34,3 +89,92 @@ def mark_as_read(
     notification.is_read = 1
     db.commit()
     return {"message": "Notification marked as read"}
+
+def _authenticate_stream(bearer_token: Optional[str], stream_token: Optional[str]) -> int:
+    if not bearer_token and not stream_token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    db = SessionLocal()
+    try:
+        if bearer_token:
+            return get_current_user(bearer_token, db).id
+        return stream_token_user_id(stream_token, db)
+    finally:
+        db.close()
+
+def _notifications_after(user_id: int, last_id: int, limit: int) -> list:
+    db = SessionLocal()
+    try:
+        rows = db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.id > last_id
+        ).order_by(Notification.id).limit(limit).all()
+        return [NotificationResponse.model_validate(n).model_dump() for n in rows]
+    finally:
+        db.close()
+
+def _sse_event(notification: dict) -> str:
+    data = NotificationResponse.model_validate(notification).model_dump_json()
+    return f"id: {notification['id']}\nevent: notification\ndata: {data}\n\n"
+
+@router.post("/stream-token", response_model=StreamToken)
+def get_stream_token(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Short-lived and only good for /stream, so the copy that lands in access logs is of little use
+    return {"token": issue_stream_token(db, current_user.id), "expires_in": STREAM_TOKEN_TTL_SECONDS}
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    token: Optional[str] = None,
+    last_id: Optional[int] = None,
+    last_event_id: Optional[int] = Header(None),
+    bearer_token: Optional[str] = Depends(optional_oauth2_scheme)
+):
+    # EventSource cannot set headers, so a stream token from /stream-token may come as ?token=
+    user_id = await run_in_threadpool(_authenticate_stream, bearer_token, token)
+    # The browser sends Last-Event-ID on reconnect; ?last_id= covers the first connect
+    resume_from = last_event_id if last_event_id is not None else last_id
+    
+    async def events():
+        entry = notification_broker.subscribe(user_id)
+        queue = entry[1]
+        sent_id = resume_from or 0
+        # Subscribed before reading the backlog, so nothing committed in between is missed
+        catching_up = resume_from is not None
+        backlog = []
+        try:
+            yield f"retry: {SSE_HEARTBEAT_SECONDS * 1000}\n\n"
+            while True:
+                if catching_up:
+                    # One page per read, continuing from the last id sent, so a far-behind
+                    # reconnect never loads the whole history in one query
+                    backlog = await run_in_threadpool(_notifications_after, user_id, sent_id, DEFAULT_PAGE_SIZE)
+                    catching_up = len(backlog) == DEFAULT_PAGE_SIZE
+                for notification in backlog:
+                    if notification["id"] > sent_id:
+                        sent_id = notification["id"]
+                        yield _sse_event(notification)
+                backlog = []
+                if await request.is_disconnected():
+                    break
+                if catching_up:
+                    continue
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if item is notification_broker.RESYNC:
+                    catching_up = True
+                else:
+                    backlog = [item]
+        finally:
+            notification_broker.unsubscribe(user_id, entry)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,92 +1,219 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Dict, Any
-from models import Job, User, MaterialUsage, SparePartUsage, Material, SparePart
+from sqlalchemy import func, case, and_, select
+from typing import List, Dict, Any, Optional
+from datetime import datetime, date
+from models import Job, User, Material, SparePart, UsageDailyRollup
 from dependencies import get_db, get_current_user
+from responses import ORJSONResponse
+import rollups
+import exports
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+def job_status_counts_statement(current_user):
+    stmt = select(Job.status, func.count(Job.id)).group_by(Job.status)
+    if current_user.role != "manager":
+        stmt = stmt.filter(Job.assigned_to == current_user.id)
+    return stmt
+
+def low_stock_counts_statement():
+    # Both low-stock counts come back from one statement as scalar subqueries
+    return select(
+        select(func.count(Material.id)).filter(
+            Material.quantity <= Material.minimum_level
+        ).scalar_subquery(),
+        select(func.count(SparePart.id)).filter(
+            SparePart.quantity <= SparePart.minimum_level
+        ).scalar_subquery()
+    )
+
+def serialize_dashboard_stats(counts: dict, low_materials: int, low_spareparts: int) -> dict:
+    return {
+        "jobs": {
+            "total": sum(counts.values()),
+            "completed": counts.get("completed", 0),
+            "in_progress": counts.get("in progress", 0),
+            "pending": counts.get("pending", 0)
+        },
+        "alerts": {
+            "low_materials": low_materials,
+            "low_spareparts": low_spareparts
+        }
+    }
+
 @router.get("/dashboard-stats")
 def get_dashboard_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     # Available to everyone, but employees just see basic stats or their own
+    counts = dict(db.execute(job_status_counts_statement(current_user)).all())
+    
     if current_user.role == "manager":
-        total_jobs = db.query(Job).count()
-        completed_jobs = db.query(Job).filter(Job.status == "completed").count()
-        in_progress_jobs = db.query(Job).filter(Job.status == "in progress").count()
-        pending_jobs = db.query(Job).filter(Job.status == "pending").count()
-        
-        low_materials = db.query(Material).filter(Material.quantity <= Material.minimum_level).count()
-        low_spareparts = db.query(SparePart).filter(SparePart.quantity <= SparePart.minimum_level).count()
+        low_materials, low_spareparts = db.execute(low_stock_counts_statement()).one()
     else:
-        total_jobs = db.query(Job).filter(Job.assigned_to == current_user.id).count()
-        completed_jobs = db.query(Job).filter(Job.assigned_to == current_user.id, Job.status == "completed").count()
-        in_progress_jobs = db.query(Job).filter(Job.assigned_to == current_user.id, Job.status == "in progress").count()
-        pending_jobs = db.query(Job).filter(Job.assigned_to == current_user.id, Job.status == "pending").count()
         low_materials = 0
         low_spareparts = 0
         
-    return {
-        "jobs": {
-            "total": total_jobs,
-            "completed": completed_jobs,
-            "in_progress": in_progress_jobs,
-            "pending": pending_jobs
-        },
-        "alerts": {
-            "low_materials": low_materials,
-            "low_spareparts": low_spareparts
-        }
-    }
+    return ORJSONResponse(serialize_dashboard_stats(counts, low_materials, low_spareparts))
+
+PERFORMANCE_SORT_FIELDS = ("completion_rate", "total_jobs", "completed_jobs", "name")
 
 @router.get("/employee-performance")
 def get_employee_performance(
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    sort: str = "completion_rate",
+    order: str = "desc",
+    limit: Optional[int] = Query(None, ge=1),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != "manager":
         raise HTTPException(status_code=403, detail="Only managers can view performance reports")
-        
-    employees = db.query(User).filter(User.role == "employee").all()
-    performance = []
+    if sort not in PERFORMANCE_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(PERFORMANCE_SORT_FIELDS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    
+    # The date window lives in the join condition so employees without jobs still appear
+    join_on = Job.assigned_to == User.id
+    if date_from is not None:
+        join_on = and_(join_on, Job.updated_at >= date_from)
+    if date_to is not None:
+        join_on = and_(join_on, Job.updated_at < date_to)
+    
+    total = func.count(Job.id)
+    completed = func.coalesce(func.sum(case((Job.status == "completed", 1), else_=0)), 0)
+    completion_rate = func.coalesce(completed * 100.0 / func.nullif(total, 0), 0)
+    sort_columns = {
+        "completion_rate": completion_rate,
+        "total_jobs": total,
+        "completed_jobs": completed,
+        "name": User.name,
+    }
+    sort_column = sort_columns[sort]
     
-    for emp in employees:
-        total = db.query(Job).filter(Job.assigned_to == emp.id).count()
-        completed = db.query(Job).filter(Job.assigned_to == emp.id, Job.status == "completed").count()
-        performance.append({
-            "employee_id": emp.id,
-            "name": emp.name,
-            "total_jobs": total,
-            "completed_jobs": completed,
-            "completion_rate": (completed / total * 100) if total > 0 else 0
-        })
+    query = db.query(
+        User.id,
+        User.name,
+        total.label("total_jobs"),
+        completed.label("completed_jobs"),
+        completion_rate.label("completion_rate")
+    ).outerjoin(Job, join_on).filter(User.role == "employee").group_by(User.id, User.name)
+    query = query.order_by(sort_column.desc() if order == "desc" else sort_column.asc(), User.id)
+    if limit is not None:
+        query = query.limit(limit)
         
-    return performance
+    return ORJSONResponse([
+        {
+            "employee_id": r.id,
+            "name": r.name,
+            "total_jobs": r.total_jobs,
+            "completed_jobs": r.completed_jobs,
+            "completion_rate": r.completion_rate
+        }
+        for r in query.all()
+    ])
 
 @router.get("/usage-trends")
 def get_usage_trends(
+    granularity: str = "day",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != "manager":
         raise HTTPException(status_code=403, detail="Only managers can view usage trends")
+    if granularity not in rollups.GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of {', '.join(rollups.GRANULARITIES)}")
         
-    # Get last 6 months or group by day etc.
-    # We will just return the material and spare part usage aggregated by date/month
-    mat_usage = db.query(
-        func.date(MaterialUsage.used_date).label('date'),
-        func.sum(MaterialUsage.quantity_used).label('total')
-    ).group_by('date').all()
-    
-    sp_usage = db.query(
-        func.date(SparePartUsage.used_date).label('date'),
-        func.sum(SparePartUsage.quantity_used).label('total')
-    ).group_by('date').all()
+    # Read the daily rollup instead of re-aggregating the usage ledgers
+    period = rollups.period_column(granularity).label('date')
+    query = db.query(
+        UsageDailyRollup.item_kind,
+        period,
+        func.sum(UsageDailyRollup.total_used).label('total')
+    )
+    if date_from is not None:
+        query = query.filter(UsageDailyRollup.day >= date_from)
+    if date_to is not None:
+        query = query.filter(UsageDailyRollup.day <= date_to)
+    rows = query.group_by(UsageDailyRollup.item_kind, period).order_by(period).all()
     
-    return {
-        "materials": [{"date": r.date, "total": r.total} for r in mat_usage],
-        "spare_parts": [{"date": r.date, "total": r.total} for r in sp_usage]
-    }
+    return ORJSONResponse({
+        "materials": [{"date": str(r.date), "total": r.total} for r in rows if r.item_kind == rollups.MATERIAL],
+        "spare_parts": [{"date": str(r.date), "total": r.total} for r in rows if r.item_kind == rollups.SPARE_PART]
+    })
+
+def _check_export(current_user: User, export_format: str):
+    if current_user.role != "manager":
+        raise HTTPException(status_code=403, detail="Only managers can export reports")
+    if export_format not in exports.FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(exports.FORMATS)}")
+
+@router.get("/export/sparepart-usages")
+def export_sparepart_usages(
+    export_format: str = Query("csv", alias="format"),
+    spare_part_id: Optional[int] = None,
+    used_by: Optional[int] = None,
+    job_id: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    current_user: User = Depends(get_current_user)
+):
+    _check_export(current_user, export_format)
+    return exports.export_response(
+        exports.usage_export_statement(rollups.SPARE_PART, spare_part_id, used_by, job_id, date_from, date_to),
+        exports.USAGE_EXPORT_HEADER[rollups.SPARE_PART],
+        "sparepart-usages",
+        export_format
+    )
+
+@router.get("/export/material-usages")
+def export_material_usages(
+    export_format: str = Query("csv", alias="format"),
+    material_id: Optional[int] = None,
+    used_by: Optional[int] = None,
+    job_id: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    current_user: User = Depends(get_current_user)
+):
+    _check_export(current_user, export_format)
+    return exports.export_response(
+        exports.usage_export_statement(rollups.MATERIAL, material_id, used_by, job_id, date_from, date_to),
+        exports.USAGE_EXPORT_HEADER[rollups.MATERIAL],
+        "material-usages",
+        export_format
+    )
+
+@router.get("/export/spareparts")
+def export_spareparts(
+    export_format: str = Query("csv", alias="format"),
+    low_only: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    _check_export(current_user, export_format)
+    return exports.export_response(
+        exports.inventory_export_statement(rollups.SPARE_PART, low_only),
+        exports.INVENTORY_EXPORT_HEADER[rollups.SPARE_PART],
+        "spareparts",
+        export_format
+    )
+
+@router.get("/export/materials")
+def export_materials(
+    export_format: str = Query("csv", alias="format"),
+    low_only: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    _check_export(current_user, export_format)
+    return exports.export_response(
+        exports.inventory_export_statement(rollups.MATERIAL, low_only),
+        exports.INVENTORY_EXPORT_HEADER[rollups.MATERIAL],
+        "materials",
+        export_format
+    )
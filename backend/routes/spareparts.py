@@ -1,18 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
-from models import SparePart, SparePartUsage, User, Notification
-from schemas import SparePartCreate, SparePartResponse, SparePartUpdate, SparePartUsageCreate, SparePartUsageResponse, MonthlySummary
+from sqlalchemy import func, select
+from typing import List, Optional
+from datetime import datetime, date
+from models import SparePart, SparePartUsage, User, UsageDailyRollup
+from schemas import SparePartCreate, SparePartResponse, SparePartUpdate, SparePartUsageCreate, SparePartUsageResponse, MonthlySummary, ImportResult
 from dependencies import get_db, get_current_user
+import rollups
+import alerts
+import metrics
+import catalog_import
+from stock import consume_stock, raise_stock_error
+from conditional import catalog_version_statement, check_not_modified
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, keyset_filter, split_page
 
 router = APIRouter(prefix="/spareparts", tags=["Spare Parts"])
 
 @router.get("/", response_model=List[SparePartResponse])
 def get_spareparts(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    version = db.execute(catalog_version_statement(SparePart)).one()
+    not_modified = check_not_modified(request, response, version)
+    if not_modified:
+        return not_modified
     return db.query(SparePart).all()
 
 @router.post("/", response_model=SparePartResponse)
@@ -30,6 +44,15 @@ def create_sparepart(
     db.refresh(new_part)
     return new_part
 
+@router.post("/import", response_model=ImportResult)
+async def import_spareparts(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Streams a text/csv body; rows are upserted by name in chunked transactions
+    return await catalog_import.import_upload(request, db, current_user, rollups.SPARE_PART)
+
 @router.put("/{part_id}", response_model=SparePartResponse)
 def update_sparepart(
     part_id: int,
@@ -44,10 +67,16 @@ def update_sparepart(
     if not part:
         raise HTTPException(status_code=404, detail="Spare part not found")
         
+    was_quantity, was_minimum = part.quantity, part.minimum_level
     update_data = part_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(part, field, value)
         
+    if alerts.became_low(was_quantity, was_minimum, part.quantity, part.minimum_level):
+        alerts.fire_low_stock_alert(
+            db, f"Spare part {part.part_name} is running low ({part.quantity} remaining)."
+        )
+        
     db.commit()
     db.refresh(part)
     return part
@@ -76,34 +105,26 @@ def use_sparepart(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    part = db.query(SparePart).filter(SparePart.id == part_id).first()
-    if not part:
-        raise HTTPException(status_code=404, detail="Spare part not found")
-        
-    if part.quantity < usage.quantity_used:
-        raise HTTPException(status_code=400, detail="Not enough stock available")
-        
-    part.quantity -= usage.quantity_used
+    part = consume_stock(db, SparePart, part_id, usage.quantity_used, SparePart.part_name)
+    if part is None:
+        raise_stock_error(db, SparePart, part_id, "Spare part not found")
     
     new_usage = SparePartUsage(
         spare_part_id=part_id,
         quantity_used=usage.quantity_used,
-        used_by=current_user.id
+        used_by=current_user.id,
+        used_date=datetime.now()
     )
     db.add(new_usage)
+    rollups.record_usage(db, rollups.SPARE_PART, part_id, usage.quantity_used, new_usage.used_date)
     
-    if part.quantity <= part.minimum_level:
-        managers = db.query(User).filter(User.role == "manager").all()
-        for mgr in managers:
-            notification = Notification(
-                user_id=mgr.id,
-                title="Low Stock Alert",
-                message=f"Spare part {part.part_name} is running low ({part.quantity} remaining).",
-                is_read=0
-            )
-            db.add(notification)
+    if alerts.crossed_low_stock(part.quantity, part.minimum_level, usage.quantity_used):
+        alerts.fire_low_stock_alert(
+            db, f"Spare part {part.part_name} is running low ({part.quantity} remaining)."
+        )
             
     db.commit()
+    metrics.record_consumption(rollups.SPARE_PART, usage.quantity_used)
     db.refresh(new_usage)
     
     return {
@@ -115,55 +136,105 @@ def use_sparepart(
         "used_date": new_usage.used_date
     }
 
-@router.get("/usages", response_model=List[SparePartUsageResponse])
-def get_sparepart_usages(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+def usage_ledger_statement(
+    spare_part_id: Optional[int],
+    used_by: Optional[int],
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    limit: int,
+    cursor: Optional[str]
 ):
-    usages = db.query(SparePartUsage).order_by(SparePartUsage.used_date.desc()).all()
+    # Names come from outer joins so the ledger is read in a single statement
+    stmt = select(
+        SparePartUsage,
+        User.name.label("used_by_name"),
+        SparePart.part_name.label("part_name")
+    ).outerjoin(User, SparePartUsage.used_by == User.id).outerjoin(
+        SparePart, SparePartUsage.spare_part_id == SparePart.id
+    )
+    
+    if spare_part_id is not None:
+        stmt = stmt.filter(SparePartUsage.spare_part_id == spare_part_id)
+    if used_by is not None:
+        stmt = stmt.filter(SparePartUsage.used_by == used_by)
+    if date_from is not None:
+        stmt = stmt.filter(SparePartUsage.used_date >= date_from)
+    if date_to is not None:
+        stmt = stmt.filter(SparePartUsage.used_date < date_to)
     
-    result = []
-    for usage in usages:
-        usage_dict = {
+    stmt = keyset_filter(stmt, SparePartUsage.used_date, SparePartUsage.id, cursor)
+    return stmt.order_by(
+        SparePartUsage.used_date.desc(), SparePartUsage.id.desc()
+    ).limit(limit + 1)
+
+def serialize_usage_page(response: Response, rows, limit: int) -> list:
+    rows, next_cursor = split_page(rows, limit, lambda r: (r[0].used_date, r[0].id))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    return [
+        {
             "id": usage.id,
             "spare_part_id": usage.spare_part_id,
             "quantity_used": usage.quantity_used,
             "used_by": usage.used_by,
-            "used_date": usage.used_date
+            "used_by_name": used_by_name,
+            "used_date": usage.used_date,
+            "part_name": part_name
         }
-        
-        if usage.used_by:
-            user = db.query(User).filter(User.id == usage.used_by).first()
-            usage_dict["used_by_name"] = user.name if user else None
-            
-        # Get part name for display convenience
-        part = db.query(SparePart).filter(SparePart.id == usage.spare_part_id).first()
-        if part:
-            usage_dict["part_name"] = part.part_name
-            
-        result.append(usage_dict)
-        
-    return result
+        for usage, used_by_name, part_name in rows
+    ]
+
+@router.get("/usages", response_model=List[SparePartUsageResponse])
+def get_sparepart_usages(
+    response: Response,
+    spare_part_id: Optional[int] = None,
+    used_by: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    rows = db.execute(
+        usage_ledger_statement(spare_part_id, used_by, date_from, date_to, limit, cursor)
+    ).all()
+    return serialize_usage_page(response, rows, limit)
 
 @router.get("/summary/monthly", response_model=List[MonthlySummary])
 def get_monthly_summary(
+    granularity: str = "month",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != "manager":
         raise HTTPException(status_code=403, detail="Only managers can view summaries")
+    if granularity not in rollups.GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"granularity must be one of {', '.join(rollups.GRANULARITIES)}")
     
-    results = db.query(
-        func.strftime('%Y-%m', SparePartUsage.used_date).label('month'),
+    # "month" carries the period label for whichever granularity was requested
+    period = rollups.period_column(granularity).label('month')
+    query = db.query(
+        period,
         SparePart.part_name,
-        func.sum(SparePartUsage.quantity_used).label('total_used')
-    ).join(SparePart).group_by('month', SparePart.part_name).all()
+        func.sum(UsageDailyRollup.total_used).label('total_used')
+    ).join(SparePart, UsageDailyRollup.item_id == SparePart.id).filter(
+        UsageDailyRollup.item_kind == rollups.SPARE_PART
+    )
+    if date_from is not None:
+        query = query.filter(UsageDailyRollup.day >= date_from)
+    if date_to is not None:
+        query = query.filter(UsageDailyRollup.day <= date_to)
+    results = query.group_by(period, SparePart.id, SparePart.part_name).order_by(period).all()
     
     return [
         {
-            "month": r.month,
+            "month": str(r.month),
             "part_name": r.part_name,
             "total_used": r.total_used
         }
         for r in results
-    ]
\ No newline at end of file
+    ]
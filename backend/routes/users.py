@@ -2,12 +2,46 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from models import User
 from schemas import UserCreate, UserLogin, Token, UserResponse
-from auth import hash_password, verify_password, create_access_token
-from dependencies import get_db, get_current_user
+from auth import hash_password, verify_password, password_needs_rehash, create_access_token
+from dependencies import get_db, get_current_user, refresh_token_version, PRIVILEGED_ROLES
+from alerts import invalidate_manager_cache
 from datetime import timedelta
+from typing import Optional
 
 router = APIRouter()
 
+def token_response(user: User) -> dict:
+    access_token = create_access_token(
+        data={"sub": str(user.id)},
+        expires_delta=timedelta(hours=24),
+        user=user
+    )
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": {
+            "id": user.id,
+            "email": user.email,
+            "name": user.name,
+            "role": user.role
+        }
+    }
+
+def apply_user_update(user: User, updated_data: UserCreate, password_hash: Optional[str]):
+    claims_before = (user.email, user.name, user.role)
+
+    user.email = updated_data.email
+    user.name = updated_data.name or ""
+    user.role = updated_data.role
+
+    if password_hash:
+        user.password = password_hash
+
+    # Tokens embed email/name/role, so any change to them or the password revokes old ones
+    if password_hash or claims_before != (user.email, user.name, user.role):
+        user.token_version = (user.token_version or 0) + 1
+
 @router.post("/register", response_model=UserResponse)
 def register(user: UserCreate, db: Session = Depends(get_db)):
     existing = db.query(User).filter(User.email == user.email).first()
@@ -23,6 +57,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    invalidate_manager_cache()
     
     return new_user
 
@@ -33,21 +68,12 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
     if not user or not verify_password(user_data.password, user.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=timedelta(hours=24)
-    )
+    # Pick up a changed BCRYPT_ROUNDS while we still hold the plain password
+    if password_needs_rehash(user.password):
+        user.password = hash_password(user_data.password)
+        db.commit()
     
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user": {
-            "id": user.id,
-            "email": user.email,
-            "name": user.name,
-            "role": user.role
-        }
-    }
+    return token_response(user)
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(current_user: User = Depends(get_current_user)):
@@ -61,7 +87,7 @@ def get_all_users(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    if current_user.role not in ["manager", "admin"]:
+    if current_user.role not in PRIVILEGED_ROLES:
         raise HTTPException(status_code=403, detail="Access denied")
 
     users = db.query(User).all()
@@ -77,7 +103,7 @@ def delete_user(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    if current_user.role not in ["manager", "admin"]:
+    if current_user.role not in PRIVILEGED_ROLES:
         raise HTTPException(status_code=403, detail="Access denied")
 
     user = db.query(User).filter(User.id == user_id).first()
@@ -87,6 +113,8 @@ def delete_user(
 
     db.delete(user)
     db.commit()
+    refresh_token_version(user_id, None)
+    invalidate_manager_cache()
 
     return {"message": "User deleted successfully"}
 
@@ -101,7 +129,7 @@ def update_user(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    if current_user.role not in ["manager", "admin"]:
+    if current_user.role not in PRIVILEGED_ROLES:
         raise HTTPException(status_code=403, detail="Access denied")
 
     user = db.query(User).filter(User.id == user_id).first()
@@ -109,14 +137,11 @@ def update_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.email = updated_data.email
-    user.name = updated_data.name or ""
-    user.role = updated_data.role
-
-    if updated_data.password:
-        user.password = hash_password(updated_data.password)
+    apply_user_update(user, updated_data, hash_password(updated_data.password) if updated_data.password else None)
 
     db.commit()
     db.refresh(user)
+    refresh_token_version(user.id, user.token_version)
+    invalidate_manager_cache()
 
     return user
\ No newline at end of file
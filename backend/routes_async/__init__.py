@@ -0,0 +1,6 @@
+from . import jobs
+from . import materials
+from . import spareparts
+from . import notifications
+from . import reports
+from . import users
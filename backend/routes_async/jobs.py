@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from models import User
+from schemas import JobCreate, JobResponse, JobUpdate, ConsumptionBatch, ConsumptionBatchResponse
+from dependencies import get_async_db, get_current_user_async, run_sync_handler
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, split_page
+from routes import jobs as sync_jobs
+from routes.jobs import job_page_statement, serialize_job
+from conditional import job_version_statement, check_not_modified
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+@router.get("/", response_model=List[JobResponse])
+async def get_jobs(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    version = (await db.execute(job_version_statement())).one()
+    not_modified = check_not_modified(request, response, version, limit, cursor)
+    if not_modified:
+        return not_modified
+    
+    jobs = (await db.execute(job_page_statement(limit, cursor))).scalars().all()
+    
+    jobs, next_cursor = split_page(jobs, limit, lambda j: (j.updated_at, j.id))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    return [serialize_job(job) for job in jobs]
+
+@router.get("/employees", response_model=List[dict])
+async def get_employees(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    employees = await db.execute(select(User.id, User.name).filter(User.role == "employee"))
+    return [{"id": e.id, "name": e.name} for e in employees]
+
+@router.post("/", response_model=JobResponse)
+async def create_job(
+    job: JobCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(db, sync_jobs.create_job, job=job, current_user=current_user)
+
+@router.put("/{job_id}", response_model=JobResponse)
+async def update_job(
+    job_id: int,
+    job_update: JobUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_jobs.update_job, job_id=job_id, job_update=job_update, current_user=current_user
+    )
+
+@router.delete("/{job_id}")
+async def delete_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(db, sync_jobs.delete_job, job_id=job_id, current_user=current_user)
+
+@router.post("/{job_id}/consume", response_model=ConsumptionBatchResponse)
+async def consume_for_job(
+    job_id: int,
+    batch: ConsumptionBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_jobs.consume_for_job, job_id=job_id, batch=batch, current_user=current_user
+    )
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from models import Material, User
+from schemas import MaterialCreate, MaterialResponse, MaterialUpdate, MaterialUsageCreate, MaterialUsageResponse
+from dependencies import get_async_db, get_current_user_async, run_sync_handler
+from routes import materials as sync_materials
+from conditional import catalog_version_statement, check_not_modified
+
+router = APIRouter(prefix="/materials", tags=["Materials"])
+
+@router.get("/", response_model=List[MaterialResponse])
+async def get_materials(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    version = (await db.execute(catalog_version_statement(Material))).one()
+    not_modified = check_not_modified(request, response, version)
+    if not_modified:
+        return not_modified
+    return (await db.execute(select(Material))).scalars().all()
+
+@router.post("/", response_model=MaterialResponse)
+async def create_material(
+    material: MaterialCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_materials.create_material, material=material, current_user=current_user
+    )
+
+@router.put("/{material_id}", response_model=MaterialResponse)
+async def update_material(
+    material_id: int,
+    material_update: MaterialUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_materials.update_material, material_id=material_id, material_update=material_update,
+        current_user=current_user
+    )
+
+@router.delete("/{material_id}")
+async def delete_material(
+    material_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_materials.delete_material, material_id=material_id, current_user=current_user
+    )
+
+@router.post("/{material_id}/use", response_model=MaterialUsageResponse)
+async def use_material(
+    material_id: int,
+    usage: MaterialUsageCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_materials.use_material, material_id=material_id, usage=usage, current_user=current_user
+    )
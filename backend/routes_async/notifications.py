@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from models import User
+from schemas import NotificationResponse, NotificationMarkRead, UnreadCount, StreamToken
+from dependencies import get_async_db, get_current_user_async, run_sync_handler
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from routes import notifications as sync_notifications
+from routes.notifications import notification_page_statement, unread_count_statement, serialize_notification_page
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+
+@router.get("/", response_model=List[NotificationResponse])
+async def get_notifications(
+    response: Response,
+    unread_only: bool = False,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    notifications = (await db.execute(
+        notification_page_statement(current_user.id, unread_only, limit, cursor)
+    )).scalars().all()
+    return serialize_notification_page(response, notifications, limit)
+
+@router.get("/unread-count", response_model=UnreadCount)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return {"unread": (await db.execute(unread_count_statement(current_user.id))).scalar()}
+
+@router.put("/read")
+async def mark_many_as_read(
+    body: NotificationMarkRead,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(db, sync_notifications.mark_many_as_read, body=body, current_user=current_user)
+
+@router.put("/{notification_id}/read")
+async def mark_as_read(
+    notification_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_notifications.mark_as_read, notification_id=notification_id, current_user=current_user
+    )
+
+@router.post("/stream-token", response_model=StreamToken)
+async def get_stream_token(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(db, sync_notifications.get_stream_token, current_user=current_user)
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from datetime import datetime, date
+from models import User
+from dependencies import get_async_db, get_current_user_async, run_sync_handler
+from responses import ORJSONResponse
+from routes import reports as sync_reports
+from routes.reports import job_status_counts_statement, low_stock_counts_statement, serialize_dashboard_stats
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+@router.get("/dashboard-stats")
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    counts = dict((await db.execute(job_status_counts_statement(current_user))).all())
+    
+    if current_user.role == "manager":
+        low_materials, low_spareparts = (await db.execute(low_stock_counts_statement())).one()
+    else:
+        low_materials = 0
+        low_spareparts = 0
+        
+    return ORJSONResponse(serialize_dashboard_stats(counts, low_materials, low_spareparts))
+
+@router.get("/employee-performance")
+async def get_employee_performance(
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    sort: str = "completion_rate",
+    order: str = "desc",
+    limit: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_reports.get_employee_performance, date_from=date_from, date_to=date_to,
+        sort=sort, order=order, limit=limit, current_user=current_user
+    )
+
+@router.get("/usage-trends")
+async def get_usage_trends(
+    granularity: str = "day",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_reports.get_usage_trends, granularity=granularity, date_from=date_from, date_to=date_to,
+        current_user=current_user
+    )
@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime, date
+from models import SparePart, User
+from schemas import SparePartCreate, SparePartResponse, SparePartUpdate, SparePartUsageCreate, SparePartUsageResponse, MonthlySummary
+from dependencies import get_async_db, get_current_user_async, run_sync_handler
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from routes import spareparts as sync_spareparts
+from routes.spareparts import usage_ledger_statement, serialize_usage_page
+from conditional import catalog_version_statement, check_not_modified
+
+router = APIRouter(prefix="/spareparts", tags=["Spare Parts"])
+
+@router.get("/", response_model=List[SparePartResponse])
+async def get_spareparts(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    version = (await db.execute(catalog_version_statement(SparePart))).one()
+    not_modified = check_not_modified(request, response, version)
+    if not_modified:
+        return not_modified
+    return (await db.execute(select(SparePart))).scalars().all()
+
+@router.get("/usages", response_model=List[SparePartUsageResponse])
+async def get_sparepart_usages(
+    response: Response,
+    spare_part_id: Optional[int] = None,
+    used_by: Optional[int] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    rows = (await db.execute(
+        usage_ledger_statement(spare_part_id, used_by, date_from, date_to, limit, cursor)
+    )).all()
+    return serialize_usage_page(response, rows, limit)
+
+@router.post("/", response_model=SparePartResponse)
+async def create_sparepart(
+    part: SparePartCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(db, sync_spareparts.create_sparepart, part=part, current_user=current_user)
+
+@router.put("/{part_id}", response_model=SparePartResponse)
+async def update_sparepart(
+    part_id: int,
+    part_update: SparePartUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_spareparts.update_sparepart, part_id=part_id, part_update=part_update,
+        current_user=current_user
+    )
+
+@router.delete("/{part_id}")
+async def delete_sparepart(
+    part_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_spareparts.delete_sparepart, part_id=part_id, current_user=current_user
+    )
+
+@router.post("/{part_id}/use", response_model=SparePartUsageResponse)
+async def use_sparepart(
+    part_id: int,
+    usage: SparePartUsageCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_spareparts.use_sparepart, part_id=part_id, usage=usage, current_user=current_user
+    )
+
+@router.get("/summary/monthly", response_model=List[MonthlySummary])
+async def get_monthly_summary(
+    granularity: str = "month",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(
+        db, sync_spareparts.get_monthly_summary, granularity=granularity, date_from=date_from, date_to=date_to,
+        current_user=current_user
+    )
@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User
+from schemas import UserCreate, UserLogin, Token, UserResponse
+from auth import hash_password_async, verify_password_async, password_needs_rehash
+from dependencies import get_async_db, get_current_user_async, run_sync_handler, refresh_token_version, PRIVILEGED_ROLES
+from alerts import invalidate_manager_cache
+from routes import users as sync_users
+from routes.users import token_response, apply_user_update
+
+router = APIRouter()
+
+@router.post("/register", response_model=UserResponse)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = (await db.execute(select(User.id).filter(User.email == user.email))).first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Email already exists")
+    
+    new_user = User(
+        email=user.email,
+        name=user.name or user.email.split('@')[0],
+        password=await hash_password_async(user.password),
+        role=user.role
+    )
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    invalidate_manager_cache()
+    
+    return new_user
+
+@router.post("/login", response_model=Token)
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(User).filter(User.email == user_data.email))).scalar_one_or_none()
+    
+    if not user or not await verify_password_async(user_data.password, user.password):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    
+    if password_needs_rehash(user.password):
+        user.password = await hash_password_async(user_data.password)
+        await db.commit()
+    
+    return token_response(user)
+
+@router.get("/me", response_model=UserResponse)
+async def get_current_user_info(current_user: User = Depends(get_current_user_async)):
+    return current_user
+
+@router.get("/users", response_model=list[UserResponse])
+async def get_all_users(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    if current_user.role not in PRIVILEGED_ROLES:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return (await db.execute(select(User))).scalars().all()
+
+@router.delete("/users/{user_id}")
+async def delete_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await run_sync_handler(db, sync_users.delete_user, user_id=user_id, current_user=current_user)
+
+@router.put("/users/{user_id}", response_model=UserResponse)
+async def update_user(
+    user_id: int,
+    updated_data: UserCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    if current_user.role not in PRIVILEGED_ROLES:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    user = (await db.execute(select(User).filter(User.id == user_id))).scalar_one_or_none()
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Hashed here rather than in the sync handler so bcrypt is awaited, not waited on
+    password_hash = await hash_password_async(updated_data.password) if updated_data.password else None
+    apply_user_update(user, updated_data, password_hash)
+
+    await db.commit()
+    await db.refresh(user)
+    refresh_token_version(user.id, user.token_version)
+    invalidate_manager_cache()
+
+    return user
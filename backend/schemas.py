@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Literal, Any
 from datetime import datetime
 
 # User schemas
@@ -118,6 +118,7 @@ class SparePartUsageResponse(SparePartUsageBase):
     used_by: int
     used_by_name: Optional[str] = None
     used_date: datetime
+    part_name: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -136,11 +137,71 @@ class NotificationResponse(NotificationBase):
     class Config:
         from_attributes = True
 
+class NotificationMarkRead(BaseModel):
+    ids: Optional[List[int]] = None  # None marks every unread notification
+
+class UnreadCount(BaseModel):
+    unread: int
+
+class StreamToken(BaseModel):
+    token: str
+    expires_in: int
+
+# Batch consumption schemas
+class ConsumptionLine(BaseModel):
+    kind: Literal["material", "sparepart"]
+    item_id: int
+    quantity: int
+
+class ConsumptionBatch(BaseModel):
+    lines: List[ConsumptionLine]
+
+class ConsumptionResult(BaseModel):
+    kind: str
+    item_id: int
+    usage_id: int
+    quantity_used: int
+    remaining: int
+
+class ConsumptionBatchResponse(BaseModel):
+    job_id: int
+    used_date: datetime
+    results: List[ConsumptionResult]
+
+# Catalog import schemas
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ImportResult(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    low_stock: int
+    errors: List[ImportRowError]
+
 class MonthlySummary(BaseModel):
     month: str
     part_name: str
     total_used: int
 
+# Diagnostics schemas
+class SlowQuery(BaseModel):
+    at: datetime
+    duration_ms: float
+    request: Optional[str] = None
+    statement: str
+    parameters: Any
+    plan: Optional[List[str]] = None
+
+class ProfileSummary(BaseModel):
+    id: int
+    method: str
+    path: str
+    started_at: datetime
+    duration_ms: float
+    samples: int
+
 # Token schema
 class Token(BaseModel):
     access_token: str
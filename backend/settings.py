@@ -0,0 +1,106 @@
+import os
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+# Trust role/name/email claims in the JWT and only check the per-user token version
+STATELESS_AUTH = env_bool("STATELESS_AUTH", True)
+# Seconds a cached token version is trusted before it is re-read from the database
+TOKEN_VERSION_CACHE_TTL = env_int("TOKEN_VERSION_CACHE_TTL", 60)
+
+# bcrypt cost factor; existing hashes with another cost are rehashed on login
+BCRYPT_ROUNDS = env_int("BCRYPT_ROUNDS", 12)
+# Processes dedicated to bcrypt; 0 hashes inline on the calling thread
+PASSWORD_HASH_WORKERS = env_int("PASSWORD_HASH_WORKERS", 2)
+# Hash/verify calls allowed in flight before new ones are rejected with 503
+PASSWORD_HASH_QUEUE_LIMIT = env_int("PASSWORD_HASH_QUEUE_LIMIT", 16)
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+# "production" applies WAL, tuned pragmas and a sized pool; "default" is a plain engine
+DB_PROFILE = os.getenv("DB_PROFILE", "production")
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW", 20)
+DB_POOL_TIMEOUT = env_int("DB_POOL_TIMEOUT", 30)
+# How long a connection waits on a locked database before giving up
+SQLITE_BUSY_TIMEOUT_MS = env_int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE_KB = env_int("SQLITE_CACHE_SIZE_KB", 65536)
+SQLITE_MMAP_SIZE = env_int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+
+# "sync" serves every route from routes/; "async" puts routes_async/ in front of them
+API_STACK = os.getenv("API_STACK", "sync")
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+)
+
+# Seconds the manager id list used for low-stock fan-out is cached
+MANAGER_CACHE_TTL = env_int("MANAGER_CACHE_TTL", 300)
+
+# Seconds between SSE heartbeats on /notifications/stream
+SSE_HEARTBEAT_SECONDS = env_int("SSE_HEARTBEAT_SECONDS", 15)
+# Notifications buffered per open stream before it falls back to re-reading from the database
+SSE_QUEUE_SIZE = env_int("SSE_QUEUE_SIZE", 100)
+# Lifetime of the stream-only tokens EventSource passes in the query string, where access logs see them
+STREAM_TOKEN_TTL_SECONDS = env_int("STREAM_TOKEN_TTL_SECONDS", 60)
+
+# Background pruning of the notifications table; 0 disables a policy. Opt-in because the
+# first run deletes every notification the policies no longer keep
+NOTIFICATION_RETENTION_ENABLED = env_bool("NOTIFICATION_RETENTION_ENABLED", False)
+NOTIFICATION_READ_RETENTION_DAYS = env_int("NOTIFICATION_READ_RETENTION_DAYS", 30)
+NOTIFICATION_UNREAD_RETENTION_DAYS = env_int("NOTIFICATION_UNREAD_RETENTION_DAYS", 0)
+NOTIFICATION_KEEP_PER_USER = env_int("NOTIFICATION_KEEP_PER_USER", 500)
+NOTIFICATION_RETENTION_INTERVAL_SECONDS = env_int("NOTIFICATION_RETENTION_INTERVAL_SECONDS", 3600)
+NOTIFICATION_RETENTION_BATCH_SIZE = env_int("NOTIFICATION_RETENTION_BATCH_SIZE", 1000)
+# Free pages handed back to the filesystem per run when auto_vacuum is incremental
+SQLITE_INCREMENTAL_VACUUM_PAGES = env_int("SQLITE_INCREMENTAL_VACUUM_PAGES", 2000)
+
+# Upgrade an out-of-date schema at startup instead of refusing to start
+AUTO_MIGRATE = env_bool("AUTO_MIGRATE", False)
+
+# Rows fetched per round trip while streaming /reports/export downloads
+EXPORT_BATCH_SIZE = env_int("EXPORT_BATCH_SIZE", 1000)
+
+# Rows validated and written per transaction by catalog imports (at most 900)
+IMPORT_CHUNK_SIZE = env_int("IMPORT_CHUNK_SIZE", 900)
+# Row errors listed in an import result; later failures are only counted
+IMPORT_MAX_ERRORS = env_int("IMPORT_MAX_ERRORS", 200)
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESSION_MINIMUM_SIZE = env_int("COMPRESSION_MINIMUM_SIZE", 1024)
+GZIP_LEVEL = env_int("GZIP_LEVEL", 6)
+# 0-11; 4 is close to gzip -6 in speed and noticeably smaller
+BROTLI_QUALITY = env_int("BROTLI_QUALITY", 4)
+
+# Per-request statement counts and DB time, reported in the Server-Timing header
+QUERY_STATS_ENABLED = env_bool("QUERY_STATS_ENABLED", True)
+# A statement shape repeated more than this many times in one request is a likely N+1
+N1_QUERY_THRESHOLD = env_int("N1_QUERY_THRESHOLD", 10)
+# "warn" logs it, "raise" fails the request (for test runs), "off" skips the check
+N1_QUERY_ACTION = os.getenv("N1_QUERY_ACTION", "warn")
+
+# Prometheus text exposition on /metrics
+METRICS_ENABLED = env_bool("METRICS_ENABLED", True)
+# When set, scrapers must send "Authorization: Bearer <token>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Statements slower than this are logged with their query plan; 0 disables the check
+SLOW_QUERY_MS = env_int("SLOW_QUERY_MS", 200)
+# Slow statements kept in memory for GET /api/admin/slow-queries
+SLOW_QUERY_BUFFER_SIZE = env_int("SLOW_QUERY_BUFFER_SIZE", 200)
+# Re-plan slow SQLite statements with EXPLAIN QUERY PLAN
+SLOW_QUERY_EXPLAIN = env_bool("SLOW_QUERY_EXPLAIN", True)
+
+# Managers may profile a request with "X-Profile: 1" or "?profile=1"; off removes the hook entirely
+PROFILING_ENABLED = env_bool("PROFILING_ENABLED", True)
+PROFILE_INTERVAL_MS = env_int("PROFILE_INTERVAL_MS", 5)
+# Sampling stops after this long even if the request is still running
+PROFILE_MAX_SECONDS = env_int("PROFILE_MAX_SECONDS", 60)
+# Finished profiles kept in memory for GET /api/admin/profiles
+PROFILE_BUFFER_SIZE = env_int("PROFILE_BUFFER_SIZE", 20)
@@ -0,0 +1,85 @@
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from settings import SLOW_QUERY_MS, SLOW_QUERY_BUFFER_SIZE, SLOW_QUERY_EXPLAIN
+import query_stats
+
+logger = logging.getLogger(__name__)
+
+_recent = deque(maxlen=SLOW_QUERY_BUFFER_SIZE)
+_recent_lock = threading.Lock()
+
+def _type_name(value) -> str:
+    return "null" if value is None else type(value).__name__
+
+def parameters_shape(parameters, executemany: bool):
+    # Types only: bound values may be personal data and are not kept
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "first": parameters_shape(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: _type_name(value) for name, value in parameters.items()}
+    return [_type_name(value) for value in parameters or ()]
+
+def explain_plan(dbapi_connection, statement: str, parameters) -> list:
+    """Return SQLite's EXPLAIN QUERY PLAN for a statement as indented lines."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    # Rows are (id, parent, notused, detail); children are indented under their parent
+    depth = {0: 0}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, 0) + 1
+        lines.append("  " * (depth[node_id] - 1) + detail)
+    return lines
+
+def _record(conn, statement, parameters, executemany, elapsed):
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms < SLOW_QUERY_MS:
+        return
+
+    plan = None
+    if SLOW_QUERY_EXPLAIN and conn.dialect.name == "sqlite":
+        try:
+            first = parameters[0] if executemany else parameters
+            plan = explain_plan(conn.connection.dbapi_connection, statement, first)
+        except Exception as e:
+            plan = [f"EXPLAIN failed: {e}"]
+
+    stats = query_stats.current()
+    entry = {
+        "at": datetime.now().isoformat(timespec="milliseconds"),
+        "duration_ms": round(elapsed_ms, 2),
+        "request": f"{stats.method} {stats.path}" if stats else None,
+        "statement": statement,
+        "parameters": parameters_shape(parameters, executemany),
+        "plan": plan,
+    }
+    with _recent_lock:
+        _recent.append(entry)
+    logger.warning("slow query %s", json.dumps(entry))
+
+def instrument(engine):
+    # Timed by query_stats' listeners, which are shared with the per-request stats
+    query_stats.instrument(engine)
+    query_stats.observe(_record)
+
+def recent(limit: int, slowest_first: bool = False) -> list:
+    """The slow statements still in the buffer, newest first by default."""
+    with _recent_lock:
+        entries = list(reversed(_recent))
+    if slowest_first:
+        entries.sort(key=lambda e: e["duration_ms"], reverse=True)
+    return entries[:limit]
+
+def clear() -> int:
+    with _recent_lock:
+        count = len(_recent)
+        _recent.clear()
+    return count
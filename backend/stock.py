@@ -0,0 +1,74 @@
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import update, select, union_all, literal, case
+from sqlalchemy.orm import Session
+from models import Material, SparePart
+import rollups
+
+def consume_stock(db: Session, model, item_id: int, quantity: int, *columns):
+    """Atomically take quantity off an item's stock.
+
+    The check and the decrement are one conditional UPDATE, so concurrent
+    consumers never lose each other's writes. Returns the row's new
+    quantity, minimum_level and any extra columns, or None when the item
+    does not exist or has too little stock.
+    """
+    if quantity <= 0:
+        raise HTTPException(status_code=400, detail="Quantity used must be positive")
+    stmt = (
+        update(model)
+        .where(model.id == item_id, model.quantity >= quantity)
+        .values(quantity=model.quantity - quantity, updated_at=datetime.now())
+        .returning(model.quantity, model.minimum_level, *columns)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).first()
+
+def consume_stock_many(db: Session, model, quantities: dict, *columns) -> dict:
+    """Take stock off several items of one model in a single conditional UPDATE.
+
+    quantities maps item id to the amount to take. Only items with enough
+    stock are decremented; the result maps each of those ids to its new
+    quantity, minimum_level and extra columns, so an id missing from it
+    was not touched and the caller should roll back.
+    """
+    if any(quantity <= 0 for quantity in quantities.values()):
+        raise HTTPException(status_code=400, detail="Quantity used must be positive")
+    amount = case(quantities, value=model.id)
+    stmt = (
+        update(model)
+        .where(model.id.in_(list(quantities)), model.quantity >= amount)
+        .values(quantity=model.quantity - amount, updated_at=datetime.now())
+        .returning(model.id, model.quantity, model.minimum_level, *columns)
+        .execution_options(synchronize_session=False)
+    )
+    return {row.id: row for row in db.execute(stmt)}
+
+def raise_stock_error(db: Session, model, item_id: int, not_found_detail: str):
+    # Only reached on the failure path, to tell a missing item from a short one
+    if db.query(model.id).filter(model.id == item_id).first() is None:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    raise HTTPException(status_code=400, detail="Not enough stock available")
+
+STOCK_MODELS = {
+    rollups.MATERIAL: (Material, Material.material_name),
+    rollups.SPARE_PART: (SparePart, SparePart.part_name),
+}
+
+def stock_levels(db: Session, item_ids: dict) -> dict:
+    """Read current stock for several items of either kind in one statement.
+
+    item_ids maps an item kind to the ids wanted; the result maps
+    (kind, id) to a row with quantity, minimum_level and name.
+    """
+    selects = [
+        select(
+            literal(kind).label("kind"),
+            model.id,
+            model.quantity,
+            model.minimum_level,
+            name_column.label("name")
+        ).where(model.id.in_(item_ids.get(kind, [])))
+        for kind, (model, name_column) in STOCK_MODELS.items()
+    ]
+    return {(row.kind, row.id): row for row in db.execute(union_all(*selects))}
@@ -0,0 +1,91 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read at import time, so the test database is chosen before the app loads
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["NOTIFICATION_RETENTION_ENABLED"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+# Repeated statements fail the request, so an N+1 shows up as a test failure
+os.environ["N1_QUERY_ACTION"] = "raise"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+import main
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+def _login(client, email: str, password: str) -> dict:
+    token = client.post("/api/login", json={"email": email, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture(scope="session")
+def manager(client):
+    return _login(client, "manager@example.com", "manager123")
+
+@pytest.fixture(scope="session")
+def employee(client):
+    return _login(client, "employee@example.com", "employee123")
+
+@pytest.fixture
+def walk_pages(client):
+    def walk(path: str, headers: dict, limit: int, max_rows: int = None, **params) -> list:
+        # Follows X-Next-Cursor until the last page, or until max_rows rows are in
+        rows, cursor = [], None
+        while max_rows is None or len(rows) < max_rows:
+            page_params = {**params, "limit": limit, **({"cursor": cursor} if cursor else {})}
+            response = client.get(path, headers=headers, params=page_params)
+            assert response.status_code == 200, response.text
+            rows.extend(response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if not cursor:
+                break
+        return rows
+    return walk
+
+@pytest.fixture
+def register(client):
+    def make(name: str, role: str = "employee", password: str = "secret123") -> dict:
+        response = client.post("/api/register", json={
+            "email": f"{name.lower().replace(' ', '-')}-{os.urandom(4).hex()}@example.com",
+            "name": name,
+            "password": password,
+            "role": role,
+        })
+        assert response.status_code == 200, response.text
+        user = response.json()
+        user["headers"] = _login(client, user["email"], password)
+        return user
+    return make
+
+@pytest.fixture
+def make_material(client, manager):
+    def make(quantity: int, minimum_level: int = 0) -> int:
+        response = client.post("/api/materials/", headers=manager, json={
+            "material_name": f"Test material {os.urandom(4).hex()}",
+            "quantity": quantity,
+            "minimum_level": minimum_level,
+            "unit": "pcs",
+        })
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+    return make
+
+@pytest.fixture
+def make_sparepart(client, manager):
+    def make(quantity: int, minimum_level: int = 0) -> int:
+        response = client.post("/api/spareparts/", headers=manager, json={
+            "part_name": f"Test part {os.urandom(4).hex()}",
+            "quantity": quantity,
+            "minimum_level": minimum_level,
+        })
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+    return make
@@ -0,0 +1,16 @@
+def test_deleted_users_token_does_not_pass_for_the_next_account(client, manager, register):
+    deleted = register("Deleted manager", role="manager")
+    assert client.get("/api/me", headers=deleted["headers"]).status_code == 200
+
+    assert client.delete(f"/api/users/{deleted['id']}", headers=manager).status_code == 200
+    assert client.get("/api/me", headers=deleted["headers"]).status_code == 401
+
+    newcomer = register("Newcomer")
+    assert newcomer["id"] != deleted["id"]
+    assert client.get("/api/me", headers=deleted["headers"]).status_code == 401
+    assert client.get("/api/users", headers=deleted["headers"]).status_code == 401
+
+def test_deleting_the_newest_user_retires_its_id(client, manager, register):
+    newest = register("Newest user")
+    assert client.delete(f"/api/users/{newest['id']}", headers=manager).status_code == 200
+    assert register("After newest")["id"] > newest["id"]
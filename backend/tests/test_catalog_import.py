@@ -0,0 +1,27 @@
+import io
+import sqlite3
+from sqlalchemy import func, select
+from database import SessionLocal
+from models import Material
+import catalog_import
+import rollups
+
+def test_import_stays_under_sqlite_bound_parameter_limit(client):
+    lines = io.StringIO(
+        "material_name,quantity,minimum_level,unit\n"
+        + "".join(f"Imported material {i},10,1,pcs\n" for i in range(2000))
+    )
+    with SessionLocal() as db:
+        dbapi_connection = db.connection().connection.dbapi_connection
+        # Older SQLite builds allow only 999 bound parameters per statement
+        previous = dbapi_connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        try:
+            result = catalog_import.import_catalog(db, rollups.MATERIAL, lines)
+        finally:
+            dbapi_connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, previous)
+        imported = db.execute(
+            select(func.count(Material.id)).filter(Material.material_name.like("Imported material %"))
+        ).scalar()
+
+    assert result["created"] == 2000 and result["failed"] == 0
+    assert imported == 2000
@@ -0,0 +1,36 @@
+import os
+from sqlalchemy import delete
+from database import SessionLocal
+from models import User
+
+def test_jobs_etag_changes_when_assignee_is_replaced(client, manager, register):
+    assignee = register("Original assignee")["id"]
+    job = client.post("/api/jobs/", headers=manager, json={"job_title": "ETag check", "assigned_to": assignee})
+    assert job.status_code == 200, job.text
+
+    first = client.get("/api/jobs/", headers=manager)
+    etag = first.headers["etag"]
+    assert client.get("/api/jobs/", headers={**manager, "If-None-Match": etag}).status_code == 304
+
+    # A bulk delete leaves the job pointing at the id, so no job row changes
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.id == assignee))
+        db.commit()
+    # Same user count and token_version sum as before the delete
+    register("Replacement")
+
+    second = client.get("/api/jobs/", headers={**manager, "If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert next(j for j in second.json() if j["id"] == job.json()["id"])["assigned_name"] is None
+
+def test_jobs_etag_changes_when_assignee_is_renamed(client, manager, register):
+    assignee = register("Before rename")["id"]
+    client.post("/api/jobs/", headers=manager, json={"job_title": "Rename check", "assigned_to": assignee})
+    etag = client.get("/api/jobs/", headers=manager).headers["etag"]
+
+    response = client.put(f"/api/users/{assignee}", headers=manager, json={
+        "email": f"renamed-{os.urandom(4).hex()}@example.com", "name": "After rename", "password": "", "role": "employee",
+    })
+    assert response.status_code == 200, response.text
+    assert client.get("/api/jobs/", headers={**manager, "If-None-Match": etag}).status_code == 200
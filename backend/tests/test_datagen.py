@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy import func, select
+from benchmark.datagen import generate
+from database import SessionLocal, engine
+from models import Job
+
+def test_generated_jobs_page_through_exactly_once(client, manager, walk_pages):
+    # Cursors bind '.ffffff' timestamps, so generated rows must compare against them correctly
+    generate(engine, users=3, jobs=600, usages=20, materials=2, spareparts=2,
+             end=datetime(2026, 1, 1, 8, 30, 15, 250000), log=lambda line: None)
+
+    seen = [job["id"] for job in walk_pages("/api/jobs/", manager, limit=37)]
+
+    with SessionLocal() as db:
+        total = db.execute(select(func.count(Job.id))).scalar()
+    assert len(seen) == len(set(seen)) == total
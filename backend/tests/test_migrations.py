@@ -0,0 +1,58 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _migrate(path: str, code: str) -> str:
+    # The engine is bound when database.py is imported, so each database gets its own process
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{path}"}
+    env.pop("ASYNC_DATABASE_URL", None)
+    result = subprocess.run(
+        [sys.executable, "-c", f"import migrate\n{code}"],
+        cwd=BACKEND, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+def _schema(path: str) -> dict:
+    with sqlite3.connect(path) as connection:
+        return {
+            kind: {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))}
+            for kind in ("table", "index", "trigger")
+        }
+
+def _upgrade(path: str) -> list:
+    return _migrate(path, "migrate.upgrade()\nprint(migrate.current_revision(), migrate.head_revision())").split()
+
+def test_upgrade_builds_a_blank_database(tmp_path):
+    path = str(tmp_path / "blank.db")
+    current, head = _upgrade(path)
+    assert current == head
+
+    schema = _schema(path)
+    assert {"users", "jobs", "usage_daily_rollups", "change_counters"} <= schema["table"]
+    assert {"ix_jobs_updated_at_id", "ix_notifications_user_created_id"} <= schema["index"]
+    assert "trg_users_insert_counter" in schema["trigger"]
+
+def test_upgrade_adopts_a_legacy_create_all_database(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    # The baseline is the schema the old create_all call produced, minus Alembic's bookkeeping
+    _migrate(path, "migrate.upgrade('0001')")
+    with sqlite3.connect(path) as connection:
+        connection.execute("DROP TABLE alembic_version")
+        connection.execute("INSERT INTO users (id, email, name, role) VALUES (7, 'legacy@example.com', 'Legacy', 'employee')")
+        connection.execute("INSERT INTO material_usages (material_id, quantity_used, used_by, used_date) "
+                           "VALUES (1, 3, 7, '2025-05-05 10:00:00.000000')")
+
+    current, head = _upgrade(path)
+    assert current == head
+
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT name, token_version FROM users WHERE id = 7").fetchone() == ("Legacy", 0)
+        # 0002 backfills the rollup from the existing ledger
+        assert connection.execute(
+            "SELECT total_used, usage_count FROM usage_daily_rollups WHERE item_kind = 'material' AND item_id = 1"
+        ).fetchone() == (3, 1)
+    assert "ix_material_usages_used_date_id" in _schema(path)["index"]
@@ -0,0 +1,57 @@
+from database import SessionLocal
+from models import Notification
+from routes.notifications import _notifications_after
+
+def _add_notifications(user_id: int, count: int) -> list:
+    with SessionLocal() as db:
+        rows = [Notification(user_id=user_id, title="Test", message=f"Message {i}", is_read=0) for i in range(count)]
+        db.add_all(rows)
+        db.commit()
+        return [row.id for row in rows]
+
+def test_stream_catch_up_reads_one_page_at_a_time(register):
+    user = register("Catching up")
+    ids = _add_notifications(user["id"], 5)
+
+    first = _notifications_after(user["id"], 0, 2)
+    assert [n["id"] for n in first] == ids[:2]
+    rest = _notifications_after(user["id"], first[-1]["id"], 10)
+    assert [n["id"] for n in rest] == ids[2:]
+
+def test_pages_newest_first_and_filters_unread(client, register, walk_pages):
+    user = register("Paging reader")
+    ids = _add_notifications(user["id"], 5)
+
+    pages = walk_pages("/api/notifications/", user["headers"], limit=2)
+    assert [n["id"] for n in pages] == ids[::-1]
+
+    client.put("/api/notifications/read", headers=user["headers"], json={"ids": ids[:2]})
+    unread = walk_pages("/api/notifications/", user["headers"], limit=2, unread_only=True)
+    assert [n["id"] for n in unread] == ids[:1:-1]
+
+def test_bulk_mark_read_updates_only_the_callers_unread_rows(client, register):
+    user = register("Bulk reader")
+    other = register("Someone else")
+    ids = _add_notifications(user["id"], 4)
+    foreign = _add_notifications(other["id"], 1)
+
+    def unread(headers):
+        return client.get("/api/notifications/unread-count", headers=headers).json()["unread"]
+
+    response = client.put("/api/notifications/read", headers=user["headers"], json={"ids": ids[:2] + foreign})
+    assert response.json()["updated"] == 2
+    assert unread(user["headers"]) == 2
+    assert unread(other["headers"]) == 1
+
+    # Already-read rows are not counted again; no ids means everything unread
+    assert client.put("/api/notifications/read", headers=user["headers"], json={}).json()["updated"] == 2
+    assert unread(user["headers"]) == 0
+
+def test_mark_one_read_is_scoped_to_the_owner(client, register):
+    user = register("Single reader")
+    other = register("Not the owner")
+    [notification_id] = _add_notifications(user["id"], 1)
+
+    assert client.put(f"/api/notifications/{notification_id}/read", headers=other["headers"]).status_code == 404
+    assert client.put(f"/api/notifications/{notification_id}/read", headers=user["headers"]).status_code == 200
+    assert client.get("/api/notifications/unread-count", headers=user["headers"]).json()["unread"] == 0
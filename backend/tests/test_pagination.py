@@ -0,0 +1,62 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from database import SessionLocal
+from models import Job, SparePartUsage
+from pagination import decode_cursor, encode_cursor
+
+# Later than anything the app writes, so these rows open the newest-first listing
+TIED_AT = datetime(2099, 1, 1, 12, 0, 0, 123456)
+
+def test_job_pages_have_no_duplicates_or_gaps_across_a_timestamp_tie(client, manager, walk_pages):
+    created = [
+        client.post("/api/jobs/", headers=manager, json={"job_title": f"Tied job {i}"}).json()["id"]
+        for i in range(7)
+    ]
+    with SessionLocal() as db:
+        db.execute(update(Job).where(Job.id.in_(created)).values(updated_at=TIED_AT))
+        db.commit()
+        expected = db.execute(
+            select(Job.id).order_by(Job.updated_at.desc(), Job.id.desc()).limit(10)
+        ).scalars().all()
+
+    # Pages of 3 put two boundaries inside the tied group
+    seen = [job["id"] for job in walk_pages("/api/jobs/", manager, limit=3, max_rows=10)][:10]
+    assert seen == expected
+    assert set(created) <= set(seen)
+
+def test_cursor_round_trips_and_rejects_garbage():
+    ts = datetime(2026, 3, 4, 5, 6, 7, 890)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not-a-cursor")
+    assert error.value.status_code == 400
+
+def test_usage_ledger_filters_and_pages_through_tied_dates(client, manager, employee, make_sparepart, walk_pages):
+    part = make_sparepart(quantity=100)
+    other = make_sparepart(quantity=100)
+    for part_id in (part, part, part, part, part, other):
+        response = client.post(f"/api/spareparts/{part_id}/use", headers=employee,
+                               json={"spare_part_id": part_id, "quantity_used": 1})
+        assert response.status_code == 200, response.text
+    with SessionLocal() as db:
+        db.execute(update(SparePartUsage).where(SparePartUsage.spare_part_id == part).values(used_date=TIED_AT))
+        db.commit()
+        expected = db.execute(
+            select(SparePartUsage.id).where(SparePartUsage.spare_part_id == part)
+            .order_by(SparePartUsage.used_date.desc(), SparePartUsage.id.desc())
+        ).scalars().all()
+
+    rows = walk_pages("/api/spareparts/usages", manager, limit=2, spare_part_id=part)
+    assert [r["id"] for r in rows] == expected
+    assert {r["spare_part_id"] for r in rows} == {part}
+    # Names come from the joins, not a lookup per row
+    assert all(r["part_name"] and r["used_by_name"] == "Employee User" for r in rows)
+
+    window = walk_pages("/api/spareparts/usages", manager, limit=2, spare_part_id=part,
+                        **{"from": "2098-12-31T00:00:00", "to": "2099-01-02T00:00:00"})
+    assert [r["id"] for r in window] == expected
+    outside = walk_pages("/api/spareparts/usages", manager, limit=2, spare_part_id=other,
+                         **{"from": "2098-12-31T00:00:00"})
+    assert outside == []
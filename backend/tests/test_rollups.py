@@ -0,0 +1,51 @@
+from datetime import date
+from sqlalchemy import func, select
+from database import SessionLocal
+from models import MaterialUsage, SparePartUsage, UsageDailyRollup
+import rollups
+
+def _rollup_rows(db, keys) -> dict:
+    rows = db.execute(select(UsageDailyRollup)).scalars()
+    return {
+        (r.day, r.item_kind, r.item_id): (r.total_used, r.usage_count)
+        for r in rows if (r.item_kind, r.item_id) in keys
+    }
+
+def _ledger_rows(db, keys) -> dict:
+    totals = {}
+    for kind, usage, item_column in (
+        (rollups.MATERIAL, MaterialUsage, MaterialUsage.material_id),
+        (rollups.SPARE_PART, SparePartUsage, SparePartUsage.spare_part_id),
+    ):
+        day = func.date(usage.used_date)
+        for row in db.execute(
+            select(day, item_column, func.sum(usage.quantity_used), func.count(usage.id)).group_by(day, item_column)
+        ):
+            if (kind, row[1]) in keys:
+                totals[(date.fromisoformat(row[0]), kind, row[1])] = (row[2], row[3])
+    return totals
+
+def test_rollup_matches_the_usage_ledgers(client, manager, employee, make_material, make_sparepart):
+    material = make_material(quantity=100)
+    part = make_sparepart(quantity=100)
+    for quantity in (2, 3):
+        response = client.post(f"/api/materials/{material}/use", headers=employee,
+                               json={"material_id": material, "quantity_used": quantity})
+        assert response.status_code == 200, response.text
+    job = client.post("/api/jobs/", headers=manager, json={"job_title": "Rollup check"}).json()["id"]
+    response = client.post(f"/api/jobs/{job}/consume", headers=employee, json={"lines": [
+        {"kind": rollups.MATERIAL, "item_id": material, "quantity": 1},
+        {"kind": rollups.SPARE_PART, "item_id": part, "quantity": 4},
+        {"kind": rollups.SPARE_PART, "item_id": part, "quantity": 4},
+    ]})
+    assert response.status_code == 200, response.text
+
+    keys = {(rollups.MATERIAL, material), (rollups.SPARE_PART, part)}
+    with SessionLocal() as db:
+        incremental = _rollup_rows(db, keys)
+        assert incremental == _ledger_rows(db, keys)
+        assert sorted(incremental.values()) == [(6, 3), (8, 2)]
+
+        # A full rebuild from the ledgers agrees with what the upserts maintained
+        rollups.rebuild(db)
+        assert _rollup_rows(db, keys) == incremental
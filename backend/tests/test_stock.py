@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from database import SessionLocal
+from models import Material
+from stock import consume_stock, consume_stock_many
+import alerts
+import metrics
+
+def _quantity(client, manager, material_id: int) -> int:
+    materials = client.get("/api/materials/", headers=manager).json()
+    return next(m["quantity"] for m in materials if m["id"] == material_id)
+
+def _alerts_for(client, manager, name: str) -> int:
+    notifications = client.get("/api/notifications/", headers=manager, params={"limit": 500}).json()
+    return sum(1 for n in notifications if n["title"] == alerts.LOW_STOCK_TITLE and name in n["message"])
+
+def test_parallel_decrements_never_oversell(make_material):
+    material_id = make_material(100)
+
+    def use_one(_):
+        db = SessionLocal()
+        try:
+            row = consume_stock(db, Material, material_id, 1)
+            db.commit()
+            return row is not None
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        succeeded = sum(pool.map(use_one, range(120)))
+
+    db = SessionLocal()
+    try:
+        assert db.get(Material, material_id).quantity == 0
+    finally:
+        db.close()
+    assert succeeded == 100
+
+def test_consume_stock_many_skips_short_items(make_material):
+    enough, short = make_material(5), make_material(5)
+    db = SessionLocal()
+    try:
+        rows = consume_stock_many(db, Material, {enough: 3, short: 10})
+        assert set(rows) == {enough}
+        assert rows[enough].quantity == 2
+        db.rollback()
+        assert db.get(Material, enough).quantity == 5
+    finally:
+        db.close()
+
+def test_batch_is_all_or_nothing_with_per_line_errors(client, manager, employee, make_material, make_sparepart):
+    material_id, part_id = make_material(10), make_sparepart(1)
+    response = client.post("/api/jobs/1/consume", headers=employee, json={"lines": [
+        {"kind": "material", "item_id": material_id, "quantity": 4},
+        {"kind": "sparepart", "item_id": part_id, "quantity": 2},
+        {"kind": "material", "item_id": 999999, "quantity": 1},
+    ]})
+    assert response.status_code == 400
+    errors = response.json()["detail"]["errors"]
+    assert [e["line"] for e in errors] == [1, 2]
+    assert _quantity(client, manager, material_id) == 10
+
+def test_batch_books_every_line(client, manager, employee, make_material, make_sparepart):
+    material_id, part_id = make_material(10), make_sparepart(5)
+    lines = [
+        {"kind": "material", "item_id": material_id, "quantity": 2},
+        {"kind": "material", "item_id": material_id, "quantity": 2},
+        {"kind": "sparepart", "item_id": part_id, "quantity": 1},
+    ]
+    response = client.post("/api/jobs/1/consume", headers=employee, json={"lines": lines})
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert len({r["usage_id"] for r in results[:2]}) == 2
+    assert [r["remaining"] for r in results] == [6, 6, 4]
+    assert _quantity(client, manager, material_id) == 6
+
+def test_batch_lines_for_one_item_are_checked_together(client, manager, employee, make_material):
+    material_id = make_material(5)
+    response = client.post("/api/jobs/1/consume", headers=employee, json={"lines": [
+        {"kind": "material", "item_id": material_id, "quantity": 3},
+        {"kind": "material", "item_id": material_id, "quantity": 3},
+    ]})
+    assert response.status_code == 400
+    assert _quantity(client, manager, material_id) == 5
+
+def test_low_stock_alert_fires_on_the_edge_and_rearms_after_restock(client, manager, employee, make_material):
+    material_id = make_material(12, minimum_level=10)
+    name = next(m["material_name"] for m in client.get("/api/materials/", headers=manager).json() if m["id"] == material_id)
+
+    def use(quantity):
+        response = client.post(f"/api/materials/{material_id}/use", headers=employee,
+                               json={"material_id": material_id, "quantity_used": quantity})
+        assert response.status_code == 200, response.text
+
+    use(1)
+    assert _alerts_for(client, manager, name) == 0
+    use(1)  # 12 -> 10 crosses the minimum
+    assert _alerts_for(client, manager, name) == 1
+    use(1)  # already low, no repeat
+    assert _alerts_for(client, manager, name) == 1
+
+    client.put(f"/api/materials/{material_id}", headers=manager, json={"quantity": 20})
+    use(10)  # 20 -> 10 crosses again
+    assert _alerts_for(client, manager, name) == 2
+
+def test_crossed_low_stock_is_an_edge():
+    assert alerts.crossed_low_stock(10, 10, 1)
+    assert alerts.crossed_low_stock(5, 10, 6)
+    assert not alerts.crossed_low_stock(9, 10, 1)
+    assert not alerts.crossed_low_stock(11, 10, 1)
+
+def test_low_stock_alert_is_counted_only_once_committed(client):
+    def counted():
+        return metrics.LOW_STOCK_ALERTS._values.get((), 0)
+
+    before = counted()
+    with SessionLocal() as db:
+        alerts.fire_low_stock_alert(db, "Rolled back alert")
+        db.rollback()
+    assert counted() == before
+
+    with SessionLocal() as db:
+        alerts.fire_low_stock_alert(db, "Committed alert")
+        db.commit()
+    assert counted() == before + 1
@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useAuth } from '../context/AuthContext';
-import { getJobs } from '../jobs';
+import { getJobsPage } from '../jobs';
+import { getDashboardStats } from '../reports';
 import { getMaterials } from '../materials';
 import { getSparePartUsages } from '../spareparts';
 import type { Job, Material, SparePartUsage } from '../types';
@@ -19,6 +20,7 @@ import {
 const Dashboard: React.FC = () => {
   const { user } = useAuth();
   const [jobs, setJobs] = useState<Job[]>([]);
+  const [jobCounts, setJobCounts] = useState({ total: 0, pending: 0, in_progress: 0, completed: 0 });
   const [materials, setMaterials] = useState<Material[]>([]);
   const [recentParts, setRecentParts] = useState<SparePartUsage[]>([]);
   const [loading, setLoading] = useState(true);
@@ -26,12 +28,15 @@ const Dashboard: React.FC = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [jobsData, matsData, usagesData] = await Promise.all([
-          getJobs(),
+        // Counts come from the server; only the few jobs shown below are downloaded
+        const [stats, recentJobs, matsData, usagesData] = await Promise.all([
+          getDashboardStats(),
+          getJobsPage(undefined, 5),
           getMaterials(),
           getSparePartUsages()
         ]);
-        setJobs(jobsData || []);
+        setJobCounts(stats.jobs);
+        setJobs(recentJobs.jobs);
         setMaterials(matsData || []);
         setRecentParts((usagesData || []).slice(0, 5));
       } catch (error) {
@@ -48,10 +53,10 @@ const Dashboard: React.FC = () => {
     return <div className="text-center mt-10 text-red-500">Please login first.</div>;
   }
 
-  const totalJobs = jobs.length;
-  const pendingJobs = jobs.filter(j => j.status === 'pending').length;
-  const inProgressJobs = jobs.filter(j => j.status === 'in progress').length;
-  const completedJobs = jobs.filter(j => j.status === 'completed').length;
+  const totalJobs = jobCounts.total;
+  const pendingJobs = jobCounts.pending;
+  const inProgressJobs = jobCounts.in_progress;
+  const completedJobs = jobCounts.completed;
 
   const lowStockMaterials = materials.filter(
     m => m.quantity <= m.minimum_level
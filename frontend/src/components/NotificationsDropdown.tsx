@@ -1,26 +1,56 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { FaBell } from 'react-icons/fa';
-import { getNotifications, markNotificationRead } from '../notifications';
+import {
+  getNotifications,
+  getUnreadCount,
+  markNotificationRead,
+  markAllNotificationsRead,
+  openNotificationStream
+} from '../notifications';
 import type { Notification } from '../types';
 
 const NotificationsDropdown: React.FC = () => {
   const [notifications, setNotifications] = useState<Notification[]>([]);
+  const [unreadCount, setUnreadCount] = useState(0);
   const [isOpen, setIsOpen] = useState(false);
+  // Ids already listed; checked outside the state updaters, which StrictMode runs twice
+  const seenIds = useRef(new Set<number>());
 
   useEffect(() => {
-    fetchNotifications();
-    
-    // Poll every 30 seconds for new notifications
-    const interval = setInterval(fetchNotifications, 30000);
-    return () => clearInterval(interval);
+    let closeStream: (() => void) | null = null;
+    let cancelled = false;
+
+    // Load once, then let the server push anything newer
+    const start = async () => {
+      const data = await fetchNotifications();
+      if (cancelled) return;
+      const lastId = data.reduce((max, n) => Math.max(max, n.id), 0);
+      closeStream = openNotificationStream(lastId, (notification) => {
+        if (seenIds.current.has(notification.id)) return;
+        seenIds.current.add(notification.id);
+        setNotifications(prev => [notification, ...prev]);
+        if (notification.is_read === 0) setUnreadCount(count => count + 1);
+      });
+    };
+
+    start();
+    return () => {
+      cancelled = true;
+      closeStream?.();
+    };
   }, []);
 
-  const fetchNotifications = async () => {
+  const fetchNotifications = async (): Promise<Notification[]> => {
     try {
-      const data = await getNotifications();
+      // Only the newest page is loaded; the badge comes from the server-side count
+      const [data, unread] = await Promise.all([getNotifications(), getUnreadCount()]);
+      data.forEach(n => seenIds.current.add(n.id));
       setNotifications(data);
+      setUnreadCount(unread);
+      return data;
     } catch (error) {
       console.error("Failed to fetch notifications:", error);
+      return [];
     }
   };
 
@@ -30,12 +60,21 @@ const NotificationsDropdown: React.FC = () => {
       setNotifications(notifications.map(n => 
         n.id === id ? { ...n, is_read: 1 } : n
       ));
+      setUnreadCount(count => Math.max(count - 1, 0));
     } catch (error) {
       console.error("Failed to mark notification as read:", error);
     }
   };
 
-  const unreadCount = notifications.filter(n => n.is_read === 0).length;
+  const handleMarkAllAsRead = async () => {
+    try {
+      await markAllNotificationsRead();
+      setNotifications(notifications.map(n => ({ ...n, is_read: 1 })));
+      setUnreadCount(0);
+    } catch (error) {
+      console.error("Failed to mark notifications as read:", error);
+    }
+  };
 
   return (
     <div className="relative">
@@ -56,9 +95,17 @@ const NotificationsDropdown: React.FC = () => {
           <div className="p-4 border-b border-gray-100 flex justify-between items-center bg-gray-50">
             <h3 className="font-semibold text-gray-800">Notifications</h3>
             {unreadCount > 0 && (
-              <span className="bg-primary-100 text-primary-800 text-xs font-medium px-2.5 py-0.5 rounded">
-                {unreadCount} New
-              </span>
+              <div className="flex items-center gap-2">
+                <span className="bg-primary-100 text-primary-800 text-xs font-medium px-2.5 py-0.5 rounded">
+                  {unreadCount} New
+                </span>
+                <button
+                  onClick={handleMarkAllAsRead}
+                  className="text-xs text-primary-600 hover:text-primary-800"
+                >
+                  Mark all read
+                </button>
+              </div>
             )}
           </div>
           
@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react';
-import { getDashboardStats, getEmployeePerformance, getUsageTrends } from '../reports';
+import { getDashboardStats, getEmployeePerformance, getUsageTrends, downloadExport } from '../reports';
 import { useAuth } from '../context/AuthContext';
 import { 
   BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer,
@@ -71,12 +71,26 @@ const Reports: React.FC = () => {
         </div>
         
         {user?.role === 'manager' && (
-          <button 
-            onClick={exportPDF}
-            className="bg-primary-600 text-white px-4 py-2 rounded shadow hover:bg-primary-700 transition"
-          >
-            Export to PDF
-          </button>
+          <div className="flex gap-2">
+            <button 
+              onClick={() => downloadExport('sparepart-usages')}
+              className="bg-white text-gray-700 px-4 py-2 rounded shadow border border-gray-200 hover:bg-gray-50 transition"
+            >
+              Spare Part Usage CSV
+            </button>
+            <button 
+              onClick={() => downloadExport('material-usages')}
+              className="bg-white text-gray-700 px-4 py-2 rounded shadow border border-gray-200 hover:bg-gray-50 transition"
+            >
+              Material Usage CSV
+            </button>
+            <button 
+              onClick={exportPDF}
+              className="bg-primary-600 text-white px-4 py-2 rounded shadow hover:bg-primary-700 transition"
+            >
+              Export to PDF
+            </button>
+          </div>
         )}
       </div>
 
@@ -1,8 +1,8 @@
 import React, { useEffect, useState } from 'react';
-import { getSpareParts, createSparePart, updateSparePart, deleteSparePart, reportSparePartUsage } from '../spareparts';
+import { getSpareParts, createSparePart, updateSparePart, deleteSparePart, reportSparePartUsage, importSpareParts } from '../spareparts';
 import type { SparePart } from '../types';
 import { useAuth } from '../context/AuthContext';
-import { FaEdit, FaTrash, FaPlus, FaMinusCircle } from 'react-icons/fa';
+import { FaEdit, FaTrash, FaPlus, FaMinusCircle, FaFileImport } from 'react-icons/fa';
 
 const SpareParts: React.FC = () => {
   const { user } = useAuth();
@@ -84,15 +84,36 @@ const SpareParts: React.FC = () => {
     }
   };
 
+  const handleImport = async (e: React.ChangeEvent<HTMLInputElement>) => {
+    const file = e.target.files?.[0];
+    e.target.value = '';
+    if (!file) return;
+    try {
+      const result = await importSpareParts(file);
+      const errors = result.errors.map(err => `Row ${err.row}: ${err.error}`).join('\n');
+      alert(`Imported: ${result.created} added, ${result.updated} updated, ${result.failed} failed.` + (errors ? `\n\n${errors}` : ''));
+      fetchParts();
+    } catch (err) {
+      alert("Failed to import file.");
+    }
+  };
+
   return (
     <div>
       <div className="flex justify-between items-center mb-6">
         <h1 className="text-3xl font-bold text-gray-800">Spare Parts</h1>
         {user?.role === 'manager' && (
-          <button onClick={() => setShowForm(true)} className="bg-primary-600 text-white px-4 py-2 rounded hover:bg-primary-700 flex items-center">
-            <FaPlus className="mr-2" />
+          <div className="flex gap-2">
+            <label className="bg-white text-gray-700 px-4 py-2 rounded border border-gray-200 hover:bg-gray-50 flex items-center cursor-pointer">
+              <FaFileImport className="mr-2" />
+              Import CSV
+              <input type="file" accept=".csv,text/csv" onChange={handleImport} className="hidden" />
+            </label>
+            <button onClick={() => setShowForm(true)} className="bg-primary-600 text-white px-4 py-2 rounded hover:bg-primary-700 flex items-center">
+              <FaPlus className="mr-2" />
               Add Spare Part
             </button>
+          </div>
         )}
       </div>
 
@@ -1,9 +1,26 @@
 import api from './axiosConfig';
 import type { Job } from './types';
 
+export interface JobPage {
+  jobs: Job[];
+  nextCursor: string | null;
+}
+
+export const getJobsPage = async (cursor?: string, limit = 500): Promise<JobPage> => {
+  const response = await api.get('/jobs', { params: { limit, cursor } });
+  return { jobs: response.data, nextCursor: response.headers['x-next-cursor'] ?? null };
+};
+
+// Follows X-Next-Cursor to the last page, for views that list every job
 export const getJobs = async (): Promise<Job[]> => {
-  const response = await api.get('/jobs');
-  return response.data;
+  const jobs: Job[] = [];
+  let cursor: string | undefined;
+  do {
+    const page = await getJobsPage(cursor);
+    jobs.push(...page.jobs);
+    cursor = page.nextCursor ?? undefined;
+  } while (cursor);
+  return jobs;
 };
 
 export const createJob = async (job: Partial<Job>): Promise<{ id: number }> => {
@@ -1,5 +1,5 @@
 import api from './axiosConfig';
-import type { Material, MaterialUsage } from './types';
+import type { ImportResult, Material, MaterialUsage } from './types';
 
 export const getMaterials = async (): Promise<Material[]> => {
   const response = await api.get('/materials');
@@ -22,4 +22,12 @@ export const deleteMaterial = async (id: number): Promise<void> => {
 export const reportMaterialUsage = async (id: number, quantity_used: number): Promise<MaterialUsage> => {
   const response = await api.post(`/materials/${id}/use`, { material_id: id, quantity_used });
   return response.data;
-};
\ No newline at end of file
+};
+
+// Columns: material_name, quantity, minimum_level, unit; rows are matched to existing items by name
+export const importMaterials = async (file: File): Promise<ImportResult> => {
+  const response = await api.post('/materials/import', file, {
+    headers: { 'Content-Type': 'text/csv' },
+  });
+  return response.data;
+};
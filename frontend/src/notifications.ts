@@ -1,11 +1,70 @@
 import api from './axiosConfig';
 import type { Notification } from './types';
 
-export const getNotifications = async (): Promise<Notification[]> => {
-  const response = await api.get('/notifications');
+export const getNotifications = async (limit = 20): Promise<Notification[]> => {
+  const response = await api.get('/notifications', { params: { limit } });
   return response.data;
 };
 
+export const getUnreadCount = async (): Promise<number> => {
+  const response = await api.get('/notifications/unread-count');
+  return response.data.unread;
+};
+
 export const markNotificationRead = async (id: number): Promise<void> => {
   await api.put(`/notifications/${id}/read`);
 };
+
+export const markAllNotificationsRead = async (): Promise<void> => {
+  await api.put('/notifications/read', {});
+};
+
+const getStreamToken = async (): Promise<string> => {
+  const response = await api.post('/notifications/stream-token');
+  return response.data.token;
+};
+
+// Live notifications over Server-Sent Events. EventSource cannot send headers, so the
+// stream is opened with a short-lived, stream-only token in the query string instead of
+// the session token, which would otherwise end up in access logs. The browser's own
+// reconnects reuse that URL; once the token has expired they fail and the stream is
+// reopened here with a fresh token, resuming after the last notification seen.
+// Returns a function that closes the stream.
+export const openNotificationStream = (
+  lastId: number,
+  onNotification: (notification: Notification) => void
+): (() => void) => {
+  let source: EventSource | null = null;
+  let retry: ReturnType<typeof setTimeout> | undefined;
+  let closed = false;
+
+  const reconnectLater = () => {
+    if (!closed) retry = setTimeout(connect, 5000);
+  };
+
+  const connect = async () => {
+    try {
+      const token = await getStreamToken();
+      if (closed) return;
+      const params = new URLSearchParams({ token, last_id: String(lastId) });
+      source = new EventSource(`${api.defaults.baseURL}/notifications/stream?${params}`);
+      source.addEventListener('notification', (event) => {
+        const notification: Notification = JSON.parse((event as MessageEvent).data);
+        lastId = Math.max(lastId, notification.id);
+        onNotification(notification);
+      });
+      source.onerror = () => {
+        if (source?.readyState === EventSource.CLOSED) reconnectLater();
+      };
+    } catch {
+      reconnectLater();
+    }
+  };
+
+  connect();
+  return () => {
+    closed = true;
+    clearTimeout(retry);
+    source?.close();
+  };
+};
@@ -14,3 +14,19 @@ export const getUsageTrends = async () => {
   const response = await api.get('/reports/usage-trends');
   return response.data;
 };
+
+export type ExportName = 'sparepart-usages' | 'material-usages' | 'spareparts' | 'materials';
+
+// Fetched through the api client so the bearer token is sent, then handed to the browser as a file
+export const downloadExport = async (name: ExportName, format: 'csv' | 'xlsx' = 'csv') => {
+  const response = await api.get(`/reports/export/${name}`, {
+    params: { format },
+    responseType: 'blob',
+  });
+  const url = URL.createObjectURL(response.data);
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = `${name}.${format}`;
+  link.click();
+  URL.revokeObjectURL(url);
+};
@@ -1,5 +1,5 @@
 import api from './axiosConfig';
-import type { SparePart, SparePartUsage, MonthlySummary } from './types';
+import type { ImportResult, SparePart, SparePartUsage, MonthlySummary } from './types';
 
 export const getSpareParts = async (): Promise<SparePart[]> => {
   const response = await api.get('/spareparts');
@@ -32,4 +32,12 @@ export const getSparePartUsages = async (): Promise<SparePartUsage[]> => {
 export const getMonthlySummary = async (): Promise<MonthlySummary[]> => {
   const response = await api.get('/spareparts/summary/monthly');
   return response.data;
-};
\ No newline at end of file
+};
+
+// Columns: part_name, quantity, minimum_level; rows are matched to existing items by name
+export const importSpareParts = async (file: File): Promise<ImportResult> => {
+  const response = await api.post('/spareparts/import', file, {
+    headers: { 'Content-Type': 'text/csv' },
+  });
+  return response.data;
+};
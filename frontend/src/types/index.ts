@@ -63,4 +63,11 @@ export interface MonthlySummary {
   month: string;
   part_name: string;
   total_used: number;
-}
\ No newline at end of file
+}
+export interface ImportResult {
+  created: number;
+  updated: number;
+  failed: number;
+  low_stock: number;
+  errors: { row: number; error: string }[];
+}